@@ -54,13 +54,34 @@ class CollisionManager:
 
         Args:
             robot (SingleArm or Bimanual): pykin robot
-            fk (OrderedDict): result(forward kinematics) of computing robots' forward kinematics
+            fk (dict): result(forward kinematics) of computing robots' forward kinematics
             geom (str): robot's geometry type name ("visual" or "collision")
         """
         if not self.is_robot:
             raise ValueError("Check argument!! Is is_robot True?")
         self.geom = geom
         self._filter_contact_names(robot, geom)
+        self._robot_link_names = [
+            link for link in robot.info[geom] if link in self._objs
+        ]
+
+    def set_robot_transforms(self, robot):
+        """
+        Set the transforms of robot's links from robot's info
+        (updated by robot.set_transform)
+
+        Args:
+            robot (SingleArm or Bimanual): pykin robot
+        """
+        info = robot.info[self.geom]
+        # links removed from the manager after setup are skipped
+        self.set_transforms(
+            {
+                link: info[link][3]
+                for link in self._robot_link_names
+                if link in self._objs
+            }
+        )
 
     def setup_gripper_collision(self, robot, fk=None, geom="collision"):
         if fk is None:
@@ -88,7 +109,7 @@ class CollisionManager:
 
         Args:
             robot (SingleArm or Binmanul): pykin robot
-            fk (OrderedDict): result(forward kinematics) of computing robots' forward kinematics
+            fk (dict): result(forward kinematics) of computing robots' forward kinematics
             geom (str): robot's geometry type name ("visual" or "collision")
         """
         for link, info in robot.info[geom].items():
@@ -114,7 +135,7 @@ class CollisionManager:
 
         if h_mat is None:
             h_mat = np.eye(4)
-        h_mat = np.asanyarray(h_mat, dtype=np.float32)
+        h_mat = np.asanyarray(h_mat, dtype=np.float64)
         if h_mat.shape != (4, 4):
             if h_mat.shape == (3,):
                 h_mat = get_h_mat(position=h_mat)
@@ -159,6 +180,53 @@ class CollisionManager:
         else:
             raise ValueError("{} not in collision manager!".format(name))
 
+    def set_transforms(self, h_mats):
+        """
+        Set the transforms for several of the manager's objects
+        and refit the broadphase tree once.
+
+        Args:
+            h_mats (dict): object name -> homogeneous transform matrix
+        """
+        for name, h_mat in h_mats.items():
+            if name not in self._objs:
+                raise ValueError("{} not in collision manager!".format(name))
+            o = self._objs[name]["obj"]
+            o.setRotation(h_mat[:3, :3])
+            o.setTranslation(h_mat[:3, 3])
+        self._manager.update()
+
+    def snapshot(self):
+        """
+        Save the current transforms of all objects in the manager.
+        Cheaper than deepcopying the manager when objects are only moved.
+
+        Returns:
+            snap (dict): object name -> (rotation, translation)
+        """
+        return {
+            name: (
+                info["obj"].getRotation().copy(),
+                info["obj"].getTranslation().copy(),
+            )
+            for name, info in self._objs.items()
+        }
+
+    def restore(self, snap):
+        """
+        Restore object transforms saved by snapshot()
+
+        Args:
+            snap (dict): result of snapshot()
+        """
+        for name, (rot, pos) in snap.items():
+            if name not in self._objs:
+                continue
+            o = self._objs[name]["obj"]
+            o.setRotation(rot)
+            o.setTranslation(pos)
+        self._manager.update()
+
     def remove_object(self, name):
         """
         Delete an object from the collision manager.
@@ -294,17 +362,36 @@ class CollisionManager:
             return result
 
     def get_distances_internal(self):
+        """
+        Get the distance between every pair of objects in the manager.
+
+        Distance is symmetric, so each unordered pair is computed once and
+        shared by both orderings. FCL's result can depend slightly on the
+        argument order (up to about 1e-5), so (o2, o1) is only approximately
+        what fcl.distance(o2, o1) would return.
+
+        Returns:
+            result (defaultdict): (name1, name2) -> distance rounded to 6 decimals,
+                                  for every ordered pair not in filtered_link_names
+        """
         req = fcl.DistanceRequest()
         res = fcl.DistanceResult()
 
-        result = collections.defaultdict(float)
-        for (o1, o2) in list(itertools.permutations(self._objs, 2)):
-            if (o1, o2) in self.filtered_link_names:
+        filtered = self.filtered_link_names
+        distances = {}
+        for (o1, o2) in itertools.combinations(self._objs, 2):
+            if (o1, o2) in filtered and (o2, o1) in filtered:
                 continue
-            distance = np.round(
+            distances[(o1, o2)] = np.round(
                 fcl.distance(self._objs[o1]["obj"], self._objs[o2]["obj"], req, res), 6
             )
-            result[(o1, o2)] = distance
+
+        # keys in the same order as computing every ordered pair
+        result = collections.defaultdict(float)
+        for (o1, o2) in itertools.permutations(self._objs, 2):
+            if (o1, o2) in filtered:
+                continue
+            result[(o1, o2)] = distances.get((o1, o2), distances.get((o2, o1)))
 
         return result
 
@@ -27,9 +27,7 @@ panda_robot.set_transform(np.array(init_qpos))
 c_manager = CollisionManager(is_robot=True)
 c_manager.setup_robot_collision(panda_robot, geom="visual")
 
-for link, info in panda_robot.info[c_manager.geom].items():
-    if link in c_manager._objs:
-        c_manager.set_transform(name=link, h_mat=info[3])
+c_manager.set_robot_transforms(panda_robot)
 
 scene = trimesh.Scene()
 scene = apply_robot_to_scene(
@@ -53,9 +51,7 @@ doosan_robot.set_transform(np.array(init_qpos))
 c_manager = CollisionManager(is_robot=True)
 c_manager.setup_robot_collision(doosan_robot, geom="visual")
 
-for link, info in doosan_robot.info[c_manager.geom].items():
-    if link in c_manager._objs:
-        c_manager.set_transform(name=link, h_mat=info[3])
+c_manager.set_robot_transforms(doosan_robot)
 
 scene = apply_robot_to_scene(
     trimesh_scene=scene, robot=doosan_robot, geom=c_manager.geom
@@ -76,9 +72,7 @@ iiwa14.set_transform(np.array(init_qpos))
 c_manager = CollisionManager(is_robot=True)
 c_manager.setup_robot_collision(iiwa14, geom="visual")
 
-for link, info in iiwa14.info[c_manager.geom].items():
-    if link in c_manager._objs:
-        c_manager.set_transform(name=link, h_mat=info[3])
+c_manager.set_robot_transforms(iiwa14)
 
 scene = apply_robot_to_scene(trimesh_scene=scene, robot=iiwa14, geom=c_manager.geom)
 ##################################################################################################
@@ -94,9 +88,7 @@ ur5e_robot.set_transform(np.array(init_qpos))
 c_manager = CollisionManager(is_robot=True)
 c_manager.setup_robot_collision(ur5e_robot, geom="visual")
 
-for link, info in ur5e_robot.info[c_manager.geom].items():
-    if link in c_manager._objs:
-        c_manager.set_transform(name=link, h_mat=info[3])
+c_manager.set_robot_transforms(ur5e_robot)
 
 scene = apply_robot_to_scene(trimesh_scene=scene, robot=ur5e_robot, geom=c_manager.geom)
 ##################################################################################################
@@ -114,9 +106,7 @@ sawyer_robot.set_transform(np.array(init_qpos))
 c_manager = CollisionManager(is_robot=True)
 c_manager.setup_robot_collision(sawyer_robot, geom="visual")
 
-for link, info in sawyer_robot.info[c_manager.geom].items():
-    if link in c_manager._objs:
-        c_manager.set_transform(name=link, h_mat=info[3])
+c_manager.set_robot_transforms(sawyer_robot)
 
 scene = apply_robot_to_scene(
     trimesh_scene=scene, robot=sawyer_robot, geom=c_manager.geom
@@ -136,9 +126,7 @@ baxter_robot.set_transform(np.array(np.concatenate((np.zeros(1), np.array(init_q
 c_manager = CollisionManager(is_robot=True)
 c_manager.setup_robot_collision(baxter_robot, geom="visual")
 
-for link, info in baxter_robot.info[c_manager.geom].items():
-    if link in c_manager._objs:
-        c_manager.set_transform(name=link, h_mat=info[3])
+c_manager.set_robot_transforms(baxter_robot)
 
 scene = apply_robot_to_scene(
     trimesh_scene=scene, robot=baxter_robot, geom=c_manager.geom
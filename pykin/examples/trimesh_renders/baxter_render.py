@@ -28,10 +28,7 @@ c_manager = CollisionManager(is_robot=True)
 c_manager.setup_robot_collision(robot, geom="collision")
 c_manager.show_collision_info()
 
-
-for link, info in robot.info[c_manager.geom].items():
-    if link in c_manager._objs:
-        c_manager.set_transform(name=link, h_mat=info[3])
+c_manager.set_robot_transforms(robot)
 
 milk_path = current_file_path + "/../../../pykin/assets/objects/meshes/milk.stl"
 test_mesh = trimesh.load_mesh(milk_path)
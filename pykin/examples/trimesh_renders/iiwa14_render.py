@@ -23,10 +23,7 @@ c_manager.show_collision_info()
 goal_qpos = np.zeros(7)
 robot.set_transform(goal_qpos)
 
-
-for link, info in robot.info[c_manager.geom].items():
-    if link in c_manager._objs:
-        c_manager.set_transform(name=link, h_mat=info[3])
+c_manager.set_robot_transforms(robot)
 
 milk_path = current_file_path + "/../../../pykin/assets/objects/meshes/milk.stl"
 test_mesh = trimesh.load_mesh(milk_path)
@@ -26,3 +26,27 @@ def calc_jacobian(frames: list, fk: dict, jsize: int) -> np.array:
             v = np.dot(fk[frame.link.name].h_mat[:3, :3], frame.joint.axis)
             J[:, n - 1] = np.hstack((v, w))
     return J
+
+
+def calc_geometric_jacobian(
+    h_mats: np.ndarray, axes: np.ndarray, is_revolute: np.ndarray, eef_pos: np.ndarray
+) -> np.array:
+    """
+    Computes the geometric Jacobian J_i = [z_i x (p_e - p_i); z_i] of all joints at once
+
+    Args:
+        h_mats (np.array(..., dof, 4, 4)): homogeneous matrices of the actuated joints' frames
+        axes (np.array(dof, 3)): joint axes described in their own frames
+        is_revolute (np.array(dof,)): True if revolute joint, False if prismatic joint
+        eef_pos (np.array(..., 3)): end effector's position
+
+    Returns:
+        Jacobian (np.array(..., 6, dof)): return Jacobian
+    """
+    z = np.einsum("...nij,nj->...ni", h_mats[..., :3, :3], axes)
+    is_revolute = is_revolute[:, None]
+    Jv = np.where(
+        is_revolute, np.cross(z, eef_pos[..., None, :] - h_mats[..., :3, 3]), z
+    )
+    Jw = np.where(is_revolute, z, 0.0)
+    return np.concatenate((Jv, Jw), axis=-1).swapaxes(-1, -2)
@@ -1,10 +1,277 @@
 import numpy as np
-from collections import OrderedDict
+
+try:
+    # Cholesky solve of the SPD LM system without np.linalg.solve's per-call checks
+    from scipy.linalg import get_lapack_funcs
+
+    (_posv,) = get_lapack_funcs(("posv",), (np.empty((1, 1)),))
+except ImportError:
+    _posv = None
 
 from pykin.kinematics import jacobian as jac
 from pykin.kinematics.transform import Transform
 from pykin.utils import transform_utils as t_utils
-from pykin.utils.kin_utils import calc_pose_error, convert_thetas_to_dict, logging_time
+from pykin.utils.kin_utils import (
+    calc_pose_error,
+    calc_pose_error_batch,
+    convert_thetas_to_dict,
+    convert_thetas_batch_to_dict,
+    logging_time,
+)
+
+JOINT_TYPE_CODES = {"fixed": 0, "revolute": 1, "prismatic": 2}
+
+
+class FKPlan:
+    """
+    Flat (structure of arrays) description of frames for forward kinematics
+
+    Frames are stored in topological order, so a frame's parent always comes first
+    and the descendants of frame i are the contiguous range [i, subtree_end[i]).
+
+    Args:
+        frames (list or Frame()): robot's frame for forward kinematics
+    """
+
+    def __init__(self, frames):
+        if isinstance(frames, list):
+            self.frames = list(frames)
+            self.parents = list(range(-1, len(frames) - 1))
+            self.subtree_end = [len(frames)] * len(frames)
+        else:
+            self.frames = []
+            self.parents = []
+            self.subtree_end = []
+            self._flatten_recursive(frames, -1)
+
+        n_frames = len(self.frames)
+        self.link_names = [frame.link.name for frame in self.frames]
+        self.joint_names = [frame.joint.name for frame in self.frames]
+        self.jtype = np.zeros(n_frames, dtype=np.int8)
+        self.axes = np.zeros((n_frames, 3))
+        self.fixed_T = np.zeros((n_frames, 4, 4))
+        self.theta_idx = np.zeros(n_frames, dtype=np.int64)
+
+        # skew matrices of revolute axes and translation axes of prismatic joints
+        self._K = np.zeros((n_frames, 3, 3))
+        self._K2 = np.zeros((n_frames, 3, 3))
+        self._prismatic_axes = np.zeros((n_frames, 3))
+
+        cnt = 0
+        for i, frame in enumerate(self.frames):
+            dtype = frame.joint.dtype
+            if dtype not in JOINT_TYPE_CODES:
+                raise ValueError("Unsupported joint type %s." % dtype)
+            self.jtype[i] = JOINT_TYPE_CODES[dtype]
+            self.fixed_T[i] = frame.joint.offset.h_mat
+            self.theta_idx[i] = cnt
+
+            if dtype == "fixed":
+                continue
+            cnt += 1
+
+            axis = np.asarray(frame.joint.axis, dtype=np.float64)
+            self.axes[i] = axis
+            if dtype == "revolute":
+                norm = np.linalg.norm(axis)
+                if norm > t_utils._EPS:
+                    axis = axis / norm
+                x, y, z = axis
+                self._K[i] = np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]])
+                self._K2[i] = np.dot(self._K[i], self._K[i])
+            else:
+                self._prismatic_axes[i] = axis
+
+        self._is_fixed = self.jtype == JOINT_TYPE_CODES["fixed"]
+
+        # actuated joints for the geometric jacobian
+        self.active_idx = np.flatnonzero(~self._is_fixed)
+        self.active_axes = self.axes[self.active_idx]
+        self.active_is_revolute = (
+            self.jtype[self.active_idx] == JOINT_TYPE_CODES["revolute"]
+        )
+
+        # cache for update_h_mats
+        self._q = None
+        self._local = None
+        self._h_mats = None
+        self._base_h_mat = None
+
+    def _flatten_recursive(self, frame, parent):
+        """
+        Append frame and its children in depth-first order
+
+        Args:
+            frame (Frame): current frame
+            parent (int): index of parent frame (-1 if root)
+        """
+        idx = len(self.frames)
+        self.frames.append(frame)
+        self.parents.append(parent)
+        self.subtree_end.append(None)
+        for child in frame.children:
+            self._flatten_recursive(child, idx)
+        self.subtree_end[idx] = len(self.frames)
+
+    def compute_h_mats(self, base_h_mat, thetas):
+        """
+        Computes homogeneous matrices of all frames
+
+        Args:
+            base_h_mat (np.array): homogeneous matrix of the robot's offset
+            thetas (sequence of float or dict): joint angles in frame order, or joint name to angle
+
+        Returns:
+            h_mats (np.array(N, 4, 4)): homogeneous matrices ordered as link_names
+        """
+        local = self._compute_local(self._get_joint_values(thetas))
+        h_mats = np.empty_like(local)
+        self._compute_chain(base_h_mat, local, h_mats, range(len(self.frames)))
+        return h_mats
+
+    def compute_h_mats_batch(self, base_h_mat, thetas):
+        """
+        Computes homogeneous matrices of all frames for a batch of joint angles
+
+        Args:
+            base_h_mat (np.array): homogeneous matrix of the robot's offset
+            thetas (np.array(B, dof)): batch of joint angles in frame order
+
+        Returns:
+            h_mats (np.array(B, N, 4, 4)): homogeneous matrices ordered as link_names
+        """
+        thetas = np.atleast_2d(np.asarray(thetas, dtype=np.float64))
+        n_batch, n_frames = len(thetas), len(self.frames)
+
+        q = thetas[:, np.minimum(self.theta_idx, thetas.shape[1] - 1)]
+        q[:, self._is_fixed] = 0.0
+        local = self._compute_local(q.ravel(), np.tile(np.arange(n_frames), n_batch))
+        local = local.reshape(n_batch, n_frames, 4, 4)
+
+        h_mats = np.empty_like(local)
+        for i, parent in enumerate(self.parents):
+            parent_h_mat = base_h_mat if parent < 0 else h_mats[:, parent]
+            np.matmul(parent_h_mat, local[:, i], out=h_mats[:, i])
+        return h_mats
+
+    def update_h_mats(self, base_h_mat, thetas, dirty_joints=None):
+        """
+        Updates the cached homogeneous matrices,
+        recomputing only frames downstream of joints whose angle changed
+
+        Args:
+            base_h_mat (np.array): homogeneous matrix of the robot's offset
+            thetas (sequence of float or dict): joint angles in frame order, or joint name to angle
+            dirty_joints (sequence of int): indices of thetas that changed (list frames only).
+                If None, they are found by comparing with the cached angles.
+
+        Returns:
+            h_mats (np.array(N, 4, 4)): cached homogeneous matrices, overwritten by the next update
+        """
+        q = self._get_joint_values(thetas)
+        if self._h_mats is None or not np.array_equal(base_h_mat, self._base_h_mat):
+            changed = None
+        elif dirty_joints is None or isinstance(thetas, dict):
+            changed = np.flatnonzero(q != self._q)
+        else:
+            theta_idx = np.minimum(self.theta_idx, len(q) - 1)
+            changed = np.flatnonzero(np.isin(theta_idx, dirty_joints) & ~self._is_fixed)
+
+        if changed is None or len(changed) == len(self.frames):
+            self._q = q
+            self._local = self._compute_local(q)
+            self._h_mats = np.empty_like(self._local)
+            self._base_h_mat = np.array(base_h_mat, dtype=np.float64)
+            self._compute_chain(
+                self._base_h_mat, self._local, self._h_mats, range(len(self.frames))
+            )
+            return self._h_mats
+
+        if len(changed) == 0:
+            return self._h_mats
+
+        self._q[changed] = q[changed]
+        self._local[changed] = self._compute_local(q[changed], changed)
+
+        is_dirty = np.zeros(len(self.frames), dtype=bool)
+        for i in changed:
+            is_dirty[i : self.subtree_end[i]] = True
+        self._compute_chain(
+            self._base_h_mat, self._local, self._h_mats, np.flatnonzero(is_dirty)
+        )
+        return self._h_mats
+
+    def calc_jacobian(self, h_mats):
+        """
+        Computes geometric jacobian of the last frame from homogeneous matrices
+
+        Args:
+            h_mats (np.array(..., N, 4, 4)): homogeneous matrices ordered as link_names
+
+        Returns:
+            Jacobian (np.array(..., 6, dof)): return Jacobian
+        """
+        return jac.calc_geometric_jacobian(
+            h_mats[..., self.active_idx, :, :],
+            self.active_axes,
+            self.active_is_revolute,
+            h_mats[..., -1, :3, 3],
+        )
+
+    def _get_joint_values(self, thetas):
+        """
+        Returns joint value of each frame (0 for fixed joints)
+
+        Args:
+            thetas (sequence of float or dict): joint angles in frame order, or joint name to angle
+
+        Returns:
+            q (np.array(N,)): joint values
+        """
+        if isinstance(thetas, dict):
+            q = np.array([float(thetas.get(name, 0.0)) for name in self.joint_names])
+        else:
+            thetas = np.asarray(thetas, dtype=np.float64).ravel()
+            q = thetas[np.minimum(self.theta_idx, len(thetas) - 1)]
+        q[self._is_fixed] = 0.0
+        return q
+
+    def _compute_local(self, q, idx=slice(None)):
+        """
+        Computes local transforms (joint offset * joint motion)
+
+        Args:
+            q (np.array): joint values of the selected frames
+            idx (slice or np.array): selected frame indices
+
+        Returns:
+            local (np.array(n, 4, 4)): local homogeneous matrices
+        """
+        fixed_T = self.fixed_T[idx]
+        s = np.sin(q)[:, None, None]
+        c = np.cos(q)[:, None, None]
+        R = np.eye(3) + s * self._K[idx] + (1.0 - c) * self._K2[idx]
+        local = fixed_T.copy()
+        local[:, :3, :3] = np.matmul(fixed_T[:, :3, :3], R)
+        local[:, :3, 3] += np.einsum(
+            "nij,nj->ni", fixed_T[:, :3, :3], self._prismatic_axes[idx] * q[:, None]
+        )
+        return local
+
+    def _compute_chain(self, base_h_mat, local, h_mats, indices):
+        """
+        Accumulates local transforms from parent to child, in place
+
+        Args:
+            base_h_mat (np.array): homogeneous matrix of the robot's offset
+            local (np.array(N, 4, 4)): local homogeneous matrices
+            h_mats (np.array(N, 4, 4)): output homogeneous matrices
+            indices (iterable of int): frame indices to compute in topological order
+        """
+        for i in indices:
+            parent = self.parents[i]
+            parent_h_mat = base_h_mat if parent < 0 else h_mats[parent]
+            np.dot(parent_h_mat, local[i], out=h_mats[i])
 
 
 class Kinematics:
@@ -32,6 +299,7 @@ class Kinematics:
         self.active_joint_names = active_joint_names
         self.base_name = base_name
         self.eef_name = eef_name
+        self._fk_plans = {}
 
     def forward_kinematics(self, frames, thetas):
         """
@@ -42,7 +310,7 @@ class Kinematics:
             thetas (sequence of float): input joint angles
 
         Returns:
-            fk (OrderedDict): transformations
+            fk (dict): transformations
         """
 
         if not isinstance(frames, list):
@@ -50,6 +318,35 @@ class Kinematics:
         fk = self._compute_FK(frames, self.offset, thetas)
         return fk
 
+    def forward_kinematics_batch(self, frames, thetas):
+        """
+        Returns homogeneous matrices of frames for a batch of joint angles
+
+        Args:
+            frames (list or Frame()): robot's frame for forward kinematics
+            thetas (np.array(B, dof) or dict): batch of input joint angles, or
+                joint name to joint angles (np.array(B,)) for a Frame()
+
+        Returns:
+            fk (dict): link name to homogeneous matrices (np.array(B, 4, 4))
+        """
+        plan = self._get_fk_plan(frames)
+        if not isinstance(frames, list):
+            thetas = convert_thetas_batch_to_dict(self.active_joint_names, thetas)
+            # reorder columns from active joint order to frame order
+            names = [plan.joint_names[i] for i in plan.active_idx]
+            batch_size = len(next(iter(thetas.values())))
+            ordered = np.zeros((batch_size, max(len(names), 1)))
+            for i, name in enumerate(names):
+                if name in thetas:
+                    ordered[:, i] = thetas[name]
+            thetas = ordered
+        else:
+            thetas = np.atleast_2d(np.asarray(thetas, dtype=np.float64))
+
+        h_mats = plan.compute_h_mats_batch(self.offset.h_mat, thetas)
+        return {name: h_mats[:, i] for i, name in enumerate(plan.link_names)}
+
     @logging_time
     def inverse_kinematics(
         self, frames, current_joints, target_pose, method="LM2", max_iter=1000
@@ -59,14 +356,31 @@ class Kinematics:
 
         Args:
             frames (Frame()): robot's frame for invers kinematics
-            current_joints (sequence of float): input joint angles
-            target_pose (np.array): goal pose to achieve
+            current_joints (sequence of float or np.array(B, dof)): input joint angles.
+                A 2-D array is solved as B seeds at once (LM and LM2 only)
+            target_pose (np.array): goal pose to achieve, given as position and quaternion
+                or as a homogeneous matrix
             method (str): two methods to calculate IK (LM: Levenberg-marquardt, NR: Newton-raphson)
             max_iter (int): Maximum number of calculation iterations
 
         Returns:
-            joints (np.array): target joint angles
+            joints (np.array): target joint angles (of the best seed if batched)
         """
+        target_pose = self._get_target_h_mat(target_pose)
+
+        if method != "GaBO":
+            dof = len(self._get_fk_plan(frames).active_idx)
+            n_joints = np.shape(current_joints)[-1]
+            if n_joints < dof:
+                raise ValueError(f"Expected {dof} joint angles, got {n_joints}.")
+
+        if np.ndim(current_joints) == 2:
+            if method not in ("LM", "LM2"):
+                raise ValueError(f"{method} does not support batched joint angles.")
+            return self._compute_IK_LM_batch(
+                frames, current_joints, target_pose, max_iter=max_iter, method=method
+            )
+
         if method == "NR":
             joints = self._compute_IK_NR(
                 frames, current_joints, target_pose, max_iter=max_iter
@@ -95,32 +409,107 @@ class Kinematics:
             thetas (sequence of float): input joint angles
 
         Returns:
-            fk (OrderedDict): transformations
+            fk (dict): transformations
         """
-        fk = OrderedDict()
-        if not isinstance(frames, list):
-            trans = offset * frames.get_transform(thetas.get(frames.joint.name, 0.0))
-            fk[frames.link.name] = trans
-            for child in frames.children:
-                fk.update(self._compute_FK(child, trans, thetas))
-        else:
+        plan = self._get_fk_plan(frames)
+        h_mats = plan.compute_h_mats(offset.h_mat, thetas)
+
+        fk = {}
+        for frame, h_mat in zip(plan.frames, h_mats):
+            fk[frame.link.name] = Transform(
+                pos=h_mat[:3, 3].copy(),
+                rot=t_utils.get_quaternion_from_matrix(h_mat[:3, :3]),
+            )
             # To compute IK
-            cnt = 0
-            trans = offset
-            for frame in frames:
-                trans = trans * frame.get_transform(thetas[cnt])
-                fk[frame.link.name] = trans
+            if isinstance(frames, list) and self.robot_name == "baxter":
+                Baxter.add_visual_link(fk, frame)
+        return fk
+
+    def _compute_h_mats(self, frames, thetas):
+        """
+        Computes homogeneous matrices of frames without building Transform objects
+
+        Args:
+            frames (list or Frame()): robot's frame for forward kinematics
+            thetas (sequence of float): input joint angles
 
-                if frame.joint.dtype != "fixed":
-                    cnt += 1
+        Returns:
+            h_mats (np.array(N, 4, 4)): homogeneous matrices in frame order
+        """
+        plan = self._get_fk_plan(frames)
+        if not isinstance(frames, list):
+            thetas = convert_thetas_to_dict(self.active_joint_names, thetas)
+        return plan.compute_h_mats(self.offset.h_mat, thetas)
 
-                if cnt >= len(thetas):
-                    cnt -= 1
+    def calc_geometric_jacobian(self, frames, h_mats):
+        """
+        Computes jacobian of frames from already computed homogeneous matrices
 
-                if self.robot_name == "baxter":
-                    Baxter.add_visual_link(fk, frame)
+        Args:
+            frames (list): robot's frame for inverse kinematics
+            h_mats (np.array(..., N, 4, 4)): homogeneous matrices in frame order
 
-        return fk
+        Returns:
+            Jacobian (np.array(..., 6, dof)): return Jacobian
+        """
+        return self._get_fk_plan(frames).calc_jacobian(h_mats)
+
+    def update_fk(self, frames, thetas, dirty_joints=None):
+        """
+        Returns homogeneous matrices of frames from a per-frames cache,
+        recomputing only links downstream of changed joints
+
+        Args:
+            frames (list or Frame()): robot's frame for forward kinematics
+            thetas (sequence of float): input joint angles
+            dirty_joints (sequence of int): indices of thetas that changed since the last call
+                (list frames only). If None, they are found by comparing with the cached angles.
+
+        Returns:
+            h_mats (np.array(N, 4, 4)): homogeneous matrices in frame order,
+                overwritten by the next update of the same frames
+        """
+        plan = self._get_fk_plan(frames)
+        if not isinstance(frames, list):
+            thetas = convert_thetas_to_dict(self.active_joint_names, thetas)
+        return plan.update_h_mats(self.offset.h_mat, thetas, dirty_joints)
+
+    @staticmethod
+    def _get_target_h_mat(target_pose):
+        """
+        Returns homogeneous matrix of target pose
+
+        Args:
+            target_pose (np.array): position and quaternion, or homogeneous matrix
+
+        Returns:
+            h_mat (np.array): homogeneous matrix
+        """
+        target_pose = np.asarray(target_pose, dtype=np.float64)
+        if target_pose.shape == (4, 4):
+            return target_pose
+        return t_utils.get_h_mat(target_pose[:3], target_pose[3:])
+
+    def _get_fk_plan(self, frames):
+        """
+        Returns cached FKPlan of frames, building it on first use
+
+        Args:
+            frames (list or Frame()): robot's frame for forward kinematics
+
+        Returns:
+            plan (FKPlan)
+        """
+        if isinstance(frames, list):
+            key = tuple(id(frame) for frame in frames)
+        else:
+            key = id(frames)
+
+        plan = self._fk_plans.get(key)
+        if plan is None:
+            plan = FKPlan(frames)
+            self._fk_plans[key] = plan
+        return plan
 
     def _compute_IK_NR(self, frames, current_joints, target_pose, max_iter):
         """
@@ -129,7 +518,7 @@ class Kinematics:
         Args:
             frames (list or Frame()): robot's frame for inverse kinematics
             current_joints (sequence of float): input joint angles
-            target_pose (np.array): goal pose to achieve
+            target_pose (np.array): homogeneous matrix of goal pose
             max_iter (int): Maximum number of calculation iterations
 
         Returns:
@@ -138,12 +527,13 @@ class Kinematics:
         lamb = 0.5
         iterator = 1
         EPS = float(1e-6)
-        dof = len(current_joints)
+        current_joints = np.array(current_joints, dtype=np.float64).ravel()
 
-        target_pose = t_utils.get_h_mat(target_pose[:3], target_pose[3:])
+        plan = self._get_fk_plan(frames)
+        base_h_mat = self.offset.h_mat
 
-        cur_fk = self.forward_kinematics(frames, current_joints)
-        cur_pose = list(cur_fk.values())[-1].h_mat
+        cur_fk = plan.update_h_mats(base_h_mat, current_joints)
+        cur_pose = cur_fk[-1]
 
         err_pose = calc_pose_error(target_pose, cur_pose, EPS)
         err = np.linalg.norm(err_pose)
@@ -154,19 +544,15 @@ class Kinematics:
             if iterator > max_iter:
                 break
 
-            J = jac.calc_jacobian(frames, cur_fk, len(current_joints))
-            dq = lamb * np.dot(np.linalg.pinv(J), err_pose)
-            current_joints = [current_joints[i] + dq[i] for i in range(dof)]
-            cur_fk = self.forward_kinematics(frames, current_joints)
-
-            cur_pose = list(cur_fk.values())[-1].h_mat
+            J = plan.calc_jacobian(cur_fk)
+            dq = lamb * self._solve_pinv(J, err_pose)
+            current_joints[: J.shape[1]] += dq.ravel()
+            cur_fk = plan.update_h_mats(base_h_mat, current_joints)
+            cur_pose = cur_fk[-1]
             err_pose = calc_pose_error(target_pose, cur_pose, EPS)
             err = np.linalg.norm(err_pose)
 
         print(f"Iterators : {iterator-1}")
-        current_joints = np.array(
-            [float(current_joint) for current_joint in current_joints]
-        )
         return current_joints
 
     def _compute_IK_LM(self, frames, current_joints, target_pose, max_iter):
@@ -176,7 +562,7 @@ class Kinematics:
         Args:
             frames (list or Frame()): robot's frame for inverse kinematics
             current_joints (sequence of float): input joint angles
-            target_pose (np.array): goal pose to achieve
+            target_pose (np.array): homogeneous matrix of goal pose
             max_iter (int): Maximum number of calculation iterations
 
         Returns:
@@ -185,19 +571,23 @@ class Kinematics:
         print("solve with LM1")
         iterator = 1
         EPS = float(1e-12)
-        dof = len(current_joints)
+        current_joints = np.array(current_joints, dtype=np.float64).ravel()
         wn_pos = 1 / 0.3
         wn_ang = 1 / (2 * np.pi)
-        We = np.diag([wn_pos, wn_pos, wn_pos, wn_ang, wn_ang, wn_ang])
-        Wn = np.eye(dof)
+        we = np.array([wn_pos, wn_pos, wn_pos, wn_ang, wn_ang, wn_ang])
 
-        target_pose = t_utils.get_h_mat(target_pose[:3], target_pose[3:])
+        plan = self._get_fk_plan(frames)
+        base_h_mat = self.offset.h_mat
 
-        cur_fk = self.forward_kinematics(frames, current_joints)
-        cur_pose = list(cur_fk.values())[-1].h_mat
+        # joint angles past the chain's dof are passed through unchanged
+        dof = len(plan.active_idx)
+        diag = np.arange(dof)
+
+        cur_fk = plan.update_h_mats(base_h_mat, current_joints)
+        cur_pose = cur_fk[-1]
 
         err = calc_pose_error(target_pose, cur_pose, EPS)
-        Ek = float(np.dot(np.dot(err.T, We), err)[0])
+        Ek = float(np.dot(np.square(err).ravel(), we))
 
         while Ek > EPS:
             iterator += 1
@@ -206,29 +596,27 @@ class Kinematics:
 
             lamb = Ek + 0.002
 
-            J = jac.calc_jacobian(frames, cur_fk, len(current_joints))
-            J_dls = np.dot(np.dot(J.T, We), J) + np.dot(Wn, lamb)
+            J = plan.calc_jacobian(cur_fk)
+            JT_We = J.T * we
+            J_dls = np.dot(JT_We, J)
+            J_dls[diag, diag] += lamb
 
-            gerr = np.dot(np.dot(J.T, We), err)
-            dq = np.dot(np.linalg.inv(J_dls), gerr)
-            current_joints = [current_joints[i] + dq[i] for i in range(dof)]
+            gerr = np.dot(JT_We, err)
+            dq = self._solve_damped(J_dls, gerr)
+            current_joints[:dof] += dq.ravel()
 
-            cur_fk = self.forward_kinematics(frames, current_joints)
-            cur_pose = list(cur_fk.values())[-1].h_mat
+            cur_fk = plan.update_h_mats(base_h_mat, current_joints)
+            cur_pose = cur_fk[-1]
             err = calc_pose_error(target_pose, cur_pose, EPS)
-            Ek2 = float(np.dot(np.dot(err.T, We), err)[0])
+            Ek2 = float(np.dot(np.square(err).ravel(), we))
 
             if Ek2 < Ek:
                 Ek = Ek2
             else:
-                current_joints = [current_joints[i] - dq[i] for i in range(dof)]
-                cur_fk = self.forward_kinematics(frames, current_joints)
+                current_joints[:dof] -= dq.ravel()
                 break
 
         print(f"Iterators : {iterator-1}")
-        current_joints = np.array(
-            [float(current_joint) for current_joint in current_joints]
-        )
         return current_joints
 
     def _compute_IK_LM2(self, frames, current_joints, target_pose, max_iter):
@@ -238,7 +626,7 @@ class Kinematics:
         Args:
             frames (list or Frame()): robot's frame for inverse kinematics
             current_joints (sequence of float): input joint angles
-            target_pose (np.array): goal pose to achieve
+            target_pose (np.array): homogeneous matrix of goal pose
             max_iter (int): Maximum number of calculation iterations
 
         Returns:
@@ -247,19 +635,23 @@ class Kinematics:
         print("solve the problem using LM2!! ")
         iterator = 1
         EPS = float(1e-12)
-        dof = len(current_joints)
+        current_joints = np.array(current_joints, dtype=np.float64).ravel()
         wn_pos = 1 / 0.3
         wn_ang = 1 / (2 * np.pi)
-        We = np.diag([wn_pos, wn_pos, wn_pos, wn_ang, wn_ang, wn_ang])
-        Wn = np.eye(dof)
+        we = np.array([wn_pos, wn_pos, wn_pos, wn_ang, wn_ang, wn_ang])
 
-        target_pose = t_utils.get_h_mat(target_pose[:3], target_pose[3:])
+        plan = self._get_fk_plan(frames)
+        base_h_mat = self.offset.h_mat
 
-        cur_fk = self.forward_kinematics(frames, current_joints)
-        cur_pose = list(cur_fk.values())[-1].h_mat
+        # joint angles past the chain's dof are passed through unchanged
+        dof = len(plan.active_idx)
+        diag = np.arange(dof)
+
+        cur_fk = plan.update_h_mats(base_h_mat, current_joints)
+        cur_pose = cur_fk[-1]
 
         err = calc_pose_error(target_pose, cur_pose, EPS)
-        Ek = float(np.dot(np.dot(err.T, We), err)[0])
+        Ek = float(np.dot(np.square(err).ravel(), we))
 
         while Ek > EPS:
             iterator += 1
@@ -268,33 +660,166 @@ class Kinematics:
 
             lamb = Ek + 0.002
 
-            J = jac.calc_jacobian(frames, cur_fk, len(current_joints))
+            J = plan.calc_jacobian(cur_fk)
+            JT_We = J.T * we
 
-            JT = np.dot(np.dot(J.T, We), J)
-            J_dls = JT + np.dot(np.diag(np.diag(JT)), lamb)
+            J_dls = np.dot(JT_We, J)
+            J_dls[diag, diag] *= 1 + lamb
 
-            gerr = np.dot(np.dot(J.T, We), err)
-            dq = np.dot(np.linalg.inv(J_dls), gerr)
-            current_joints = [current_joints[i] + dq[i] for i in range(dof)]
+            gerr = np.dot(JT_We, err)
+            dq = self._solve_damped(J_dls, gerr)
+            current_joints[:dof] += dq.ravel()
 
-            cur_fk = self.forward_kinematics(frames, current_joints)
-            cur_pose = list(cur_fk.values())[-1].h_mat
+            cur_fk = plan.update_h_mats(base_h_mat, current_joints)
+            cur_pose = cur_fk[-1]
             err = calc_pose_error(target_pose, cur_pose, EPS)
-            Ek2 = float(np.dot(np.dot(err.T, We), err)[0])
+            Ek2 = float(np.dot(np.square(err).ravel(), we))
 
             if Ek2 < Ek:
                 Ek = Ek2
             else:
-                current_joints = [current_joints[i] - dq[i] for i in range(dof)]
-                cur_fk = self.forward_kinematics(frames, current_joints)
+                current_joints[:dof] -= dq.ravel()
                 break
 
         print(f"Iterators : {iterator-1}")
-        current_joints = np.array(
-            [float(current_joint) for current_joint in current_joints]
-        )
         return current_joints
 
+    @staticmethod
+    def _solve_pinv(J, err):
+        """
+        Computes pinv(J) * err with a linear solve on the smaller normal matrix
+
+        Args:
+            J (np.array): jacobian
+            err (np.array): pose error
+
+        Returns:
+            dq (np.array): joint step
+        """
+        try:
+            if J.shape[0] <= J.shape[1]:
+                return np.dot(J.T, np.linalg.solve(np.dot(J, J.T), err))
+            return np.linalg.solve(np.dot(J.T, J), np.dot(J.T, err))
+        except np.linalg.LinAlgError:
+            return np.dot(np.linalg.pinv(J), err)
+
+    @staticmethod
+    def _solve_damped(J_dls, gerr):
+        """
+        Solves the damped normal equation J_dls * dq = gerr
+
+        Args:
+            J_dls (np.array): symmetric positive-definite (dof, dof) matrix
+            gerr (np.array): weighted gradient of pose error
+
+        Returns:
+            dq (np.array): joint step
+        """
+        if _posv is not None:
+            _, dq, info = _posv(J_dls, gerr, lower=1)
+            if info == 0:
+                return dq
+        try:
+            return np.linalg.solve(J_dls, gerr)
+        except np.linalg.LinAlgError:
+            return np.linalg.lstsq(J_dls, gerr, rcond=None)[0]
+
+    @classmethod
+    def _solve_damped_batch(cls, J_dls, gerr):
+        """
+        Solves the damped normal equations of several seeds at once
+
+        Args:
+            J_dls (np.array(B, dof, dof)): symmetric positive-definite matrices
+            gerr (np.array(B, dof, 1)): weighted gradients of pose error
+
+        Returns:
+            dq (np.array(B, dof, 1)): joint steps
+        """
+        try:
+            return np.linalg.solve(J_dls, gerr)
+        except np.linalg.LinAlgError:
+            # a singular system only falls back for its own seed
+            return np.array([cls._solve_damped(A, b) for A, b in zip(J_dls, gerr)])
+
+    def _compute_IK_LM_batch(
+        self, frames, current_joints, target_pose, max_iter, method="LM"
+    ):
+        """
+        Computes inverse kinematics from several seeds at once using Levenberg-Marquatdt method
+
+        Args:
+            frames (list or Frame()): robot's frame for inverse kinematics
+            current_joints (np.array(B, dof)): initial joint angles of each seed
+            target_pose (np.array): homogeneous matrix of goal pose
+            max_iter (int): Maximum number of calculation iterations
+            method (str): damping of LM ("LM": identity, "LM2": diagonal of JtWeJ)
+
+        Returns:
+            joints (np.array): target joint angles of the seed with the smallest error
+        """
+        print(f"solve {len(current_joints)} seeds with {method}")
+        iterator = 1
+        EPS = float(1e-12)
+        current_joints = np.array(current_joints, dtype=np.float64)
+        wn_pos = 1 / 0.3
+        wn_ang = 1 / (2 * np.pi)
+        we = np.array([wn_pos, wn_pos, wn_pos, wn_ang, wn_ang, wn_ang])
+
+        plan = self._get_fk_plan(frames)
+        base_h_mat = self.offset.h_mat
+
+        # joint angles past the chain's dof are passed through unchanged
+        dof = len(plan.active_idx)
+        diag = np.arange(dof)
+
+        def get_weighted_errors(errs):
+            return np.einsum("bi,i->b", np.square(errs[..., 0]), we)
+
+        cur_fk = plan.compute_h_mats_batch(base_h_mat, current_joints)
+        err = calc_pose_error_batch(target_pose, cur_fk[:, -1], EPS)
+        Ek = get_weighted_errors(err)
+        is_active = Ek > EPS
+
+        while np.any(is_active):
+            iterator += 1
+            if iterator > max_iter:
+                break
+
+            idx = np.flatnonzero(is_active)
+            lamb = Ek[idx] + 0.002
+
+            J = plan.calc_jacobian(cur_fk[idx])
+            JT_We = J.transpose(0, 2, 1) * we
+            J_dls = np.matmul(JT_We, J)
+            if method == "LM2":
+                J_dls[:, diag, diag] *= 1 + lamb[:, None]
+            else:
+                J_dls[:, diag, diag] += lamb[:, None]
+
+            gerr = np.matmul(JT_We, err[idx])
+            dq = self._solve_damped_batch(J_dls, gerr)[..., 0]
+            next_joints = current_joints[idx]
+            next_joints[:, :dof] += dq
+
+            next_fk = plan.compute_h_mats_batch(base_h_mat, next_joints)
+            next_err = calc_pose_error_batch(target_pose, next_fk[:, -1], EPS)
+            Ek2 = get_weighted_errors(next_err)
+
+            # A seed whose error does not decrease stops at its current joints
+            is_improved = Ek2 < Ek[idx]
+            improved = idx[is_improved]
+            current_joints[improved] = next_joints[is_improved]
+            cur_fk[improved] = next_fk[is_improved]
+            err[improved] = next_err[is_improved]
+            Ek[improved] = Ek2[is_improved]
+
+            is_active[idx[~is_improved]] = False
+            is_active[improved] = Ek[improved] > EPS
+
+        print(f"Iterators : {iterator-1}")
+        return current_joints[np.argmin(Ek)]
+
     def _compute_IK_GaBO(
         self,
         frames,
@@ -307,7 +832,7 @@ class Kinematics:
 
         Args:
             frames (list or Frame()): robot's frame for forward kinematics
-            target_pose (np.array): goal pose to achieve
+            target_pose (np.array): homogeneous matrix of goal pose
             max_iter (int): Maximum number of bayesian optimization iterations
             opt_dimension (int) : torus dimension to optimize from end-effector frame to backward order (Recommended : 2~3)
 
@@ -344,13 +869,10 @@ class Kinematics:
         # Define pose error objective function
         def get_pose_error(target_pose, cur_point):
             cur_angle = g_util.convert_point_to_angle_torch(cur_point)
-            cur_fk = self.forward_kinematics(frames, cur_angle)
-            cur_pose = list(cur_fk.values())[-1].h_mat
+            cur_pose = self._compute_h_mats(frames, cur_angle)[-1]
             err = calc_pose_error(target_pose, cur_pose, EPS)
             return np.linalg.norm(err)
 
-        target_pose = t_utils.get_h_mat(target_pose[:3], target_pose[3:])
-
         # Define hyperparameters
         opt_dimension = opt_dimension
         robot_dimension = len(self.active_joint_names)
@@ -27,10 +27,12 @@ class Transform:
         rot (sequence of float) : The rotation parameter. Give in quaternions or roll pitch yaw.
     """
 
+    __slots__ = ("_pos", "_rot")
+
     def __init__(self, pos=np.zeros(3), rot=np.array([1.0, 0.0, 0.0, 0.0])):
-        # Set rotation, position
-        self.pos = self._to_pos(pos)
-        self.rot = self._to_quaternion(rot)
+        # Set rotation, position (setters convert the inputs)
+        self.pos = pos
+        self.rot = rot
 
     def __str__(self):
         return f"Transform({sc.MAGENTA}pos{sc.ENDC}={self.pos}, {sc.MAGENTA}rot{sc.ENDC}={ self.rot})"
@@ -1,6 +1,3 @@
-from collections import OrderedDict
-
-
 class RobotModel:
     """
     Base class of robot model from urdf file
@@ -8,8 +5,8 @@ class RobotModel:
     """
 
     def __init__(self):
-        self._links = OrderedDict()
-        self._joints = OrderedDict()
+        self._links = {}
+        self._joints = {}
 
     def find_frame(self, frame_name):
         """
@@ -45,7 +42,7 @@ class RobotModel:
     def links(self):
         """
         Returns:
-            OrderedDict: all links
+            dict: all links
         """
         return self._links
 
@@ -53,7 +50,7 @@ class RobotModel:
     def joints(self):
         """
         Returns:
-            OrderedDict: all joints
+            dict: all joints
         """
         return self._joints
 
@@ -1,7 +1,5 @@
 import io, os
 from xml.etree import ElementTree as ET
-from collections import OrderedDict
-from copy import deepcopy
 
 pykin_path = os.path.abspath(os.path.dirname(__file__) + "/../")
 
@@ -154,7 +152,7 @@ class URDFModel(RobotModel):
         """
         for idx, elem_link in enumerate(self.root.findall("link")):
             link_frame = self._get_link_frame(idx, elem_link)
-            self._links[link_frame.link.name] = deepcopy(link_frame.link)
+            self._links[link_frame.link.name] = link_frame.link
 
     def _set_joints(self):
         """
@@ -162,7 +160,7 @@ class URDFModel(RobotModel):
         """
         for idx, elem_joint in enumerate(self.root.findall("joint")):
             joint_frame = self._get_joint_frame(idx, elem_joint)
-            self._joints[joint_frame.joint.name] = deepcopy(joint_frame.joint)
+            self._joints[joint_frame.joint.name] = joint_frame.joint
 
     def _set_root(self):
         """
@@ -210,8 +208,8 @@ class URDFModel(RobotModel):
             link=Link(
                 name=link_name,
                 offset=Transform(),
-                visual=Visual(),
-                collision=Collision(),
+                visual=Visual(geom_param={}),
+                collision=Collision(geom_param={}),
             ),
         )
 
@@ -257,15 +255,15 @@ class URDFModel(RobotModel):
 
     @staticmethod
     def _generate_children_recursive(
-        root_link: Link, links: OrderedDict, joints: OrderedDict
+        root_link: Link, links: dict, joints: dict
     ) -> list:
         """
         Generates child frame recursive from current joint
 
         Args:
             root_link (Link): root link
-            links (OrderedDict): element of joint parsed from urdf file
-            joints (OrderedDict): element of joint parsed from urdf file
+            links (dict): element of joint parsed from urdf file
+            joints (dict): element of joint parsed from urdf file
 
         Returns:
             list: Append list If current joint's parent link is root link
@@ -39,16 +39,10 @@ class Bimanual(Robot):
         self.joint_limits_upper = self._input2dict(None)
 
     def set_transform(self, thetas):
-        fk = self.forward_kin(thetas)
-        for link, transform in fk.items():
-
-            collision_h_mat = np.dot(
-                transform.h_mat, self.links[link].collision.offset.h_mat
-            )
-            visual_h_mat = np.dot(transform.h_mat, self.links[link].visual.offset.h_mat)
-
-            self.info["collision"][link][3] = collision_h_mat
-            self.info["visual"][link][3] = visual_h_mat
+        collision_h_mats, visual_h_mats = self._compute_geom_h_mats(thetas)
+        for i, link in enumerate(self._link_names):
+            self.info["collision"][link][3] = collision_h_mats[i]
+            self.info["visual"][link][3] = visual_h_mats[i]
 
     def _input2dict(self, inp):
         """
@@ -185,6 +179,8 @@ class Bimanual(Robot):
         """
         if isinstance(value, (list, tuple)):
             value = np.array(value)
+        if value.shape == (4, 4):
+            return value
         return value.flatten()
 
     def compute_eef_pose(self, fk):
@@ -192,7 +188,7 @@ class Bimanual(Robot):
         Compute end effector's pose
 
         Args:
-            fk(OrderedDict)
+            fk(dict)
 
         Returns:
             vals(dict)
@@ -1,5 +1,4 @@
 import numpy as np
-from collections import OrderedDict
 
 from pykin.utils.mesh_utils import get_absolute_transform
 
@@ -16,7 +15,7 @@ class Gripper:
 
         self.tcp_position = tcp_position
 
-        self.info = OrderedDict()
+        self.info = {}
 
         self.is_attached = False
         self.attached_obj_name = None
@@ -33,32 +32,28 @@ class Gripper:
 
     def set_gripper_pose(self, eef_pose=np.eye(4)):
         tcp_pose = self.compute_tcp_pose_from_eef_pose(eef_pose)
-        T = get_absolute_transform(self.info[self.element_names[-1]][3], tcp_pose)
-        for link, info in self.info.items():
-            self.info[link][3] = np.dot(T, info[3])
+        self.set_gripper_tcp_pose(tcp_pose)
 
     def get_gripper_tcp_pose(self):
         return self.info["tcp"][3]
 
     def set_gripper_tcp_pose(self, tcp_pose=np.eye(4)):
         T = get_absolute_transform(self.info[self.element_names[-1]][3], tcp_pose)
-        for link, info in self.info.items():
-            self.info[link][3] = np.dot(T, info[3])
+        # move all links with one batched product
+        h_mats = np.matmul(T, np.array([info[3] for info in self.info.values()]))
+        for info, h_mat in zip(self.info.values(), h_mats):
+            info[3] = h_mat
 
     def compute_eef_pose_from_tcp_pose(self, tcp_pose=np.eye(4)):
         eef_pose = np.eye(4)
         eef_pose[:3, :3] = tcp_pose[:3, :3]
-        eef_pose[:3, 3] = tcp_pose[:3, 3] - np.dot(
-            abs(self.tcp_position[-1]), tcp_pose[:3, 2]
-        )
+        eef_pose[:3, 3] = tcp_pose[:3, 3] - abs(self.tcp_position[-1]) * tcp_pose[:3, 2]
         return eef_pose
 
     def compute_tcp_pose_from_eef_pose(self, eef_pose=np.eye(4)):
         tcp_pose = np.eye(4)
         tcp_pose[:3, :3] = eef_pose[:3, :3]
-        tcp_pose[:3, 3] = eef_pose[:3, 3] + np.dot(
-            abs(self.tcp_position[-1]), eef_pose[:3, 2]
-        )
+        tcp_pose[:3, 3] = eef_pose[:3, 3] + abs(self.tcp_position[-1]) * eef_pose[:3, 2]
         return tcp_pose
 
     def get_gripper_fk(self):
@@ -1,16 +1,7 @@
 import sys, os
 import numpy as np
-import signal
 import trimesh
 
-
-def handler(signum, frame):
-    exit()
-
-
-# Set the signal handler
-signal.signal(signal.SIGINT, handler)
-
 from pykin.robots.gripper import PandaGripper, Robotiq140Gripper
 from pykin.kinematics.transform import Transform
 from pykin.kinematics.kinematics import Kinematics
@@ -52,6 +43,7 @@ class Robot(URDFModel):
 
         self._setup_kinematics()
         self._setup_init_fk()
+        self._setup_link_offsets()
 
         self.joint_limits = self._get_limited_joints()
 
@@ -64,20 +56,30 @@ class Robot(URDFModel):
         return "pykin.robot.{}()".format(type(self).__name__)
 
     def set_transform(self, thetas):
-        fk = self.forward_kin(thetas)
-        for link, transform in fk.items():
-
-            collision_h_mat = np.dot(
-                transform.h_mat, self.links[link].collision.offset.h_mat
-            )
-            visual_h_mat = np.dot(transform.h_mat, self.links[link].visual.offset.h_mat)
-
-            self.info["collision"][link][3] = collision_h_mat
-            self.info["visual"][link][3] = visual_h_mat
+        collision_h_mats, visual_h_mats = self._compute_geom_h_mats(thetas)
+        for i, link in enumerate(self._link_names):
+            self.info["collision"][link][3] = collision_h_mats[i]
+            self.info["visual"][link][3] = visual_h_mats[i]
 
             if self.has_gripper:
                 if link in self.gripper.element_names:
-                    self.gripper.info[link][3] = collision_h_mat
+                    self.gripper.info[link][3] = collision_h_mats[i]
+
+    def _compute_geom_h_mats(self, thetas):
+        """
+        Computes collision and visual homogeneous matrices of all links at once
+
+        Args:
+            thetas (sequence of float): input joint angles
+
+        Returns:
+            collision_h_mats (np.array(N, 4, 4)): collision poses in link order
+            visual_h_mats (np.array(N, 4, 4)): visual poses in link order
+        """
+        h_mats = self.kin.update_fk(self.root, thetas)
+        collision_h_mats = np.matmul(h_mats, self._collision_offsets)
+        visual_h_mats = np.matmul(h_mats, self._visual_offsets)
+        return collision_h_mats, visual_h_mats
 
     def show_robot_info(self):
         """
@@ -193,6 +195,18 @@ class Robot(URDFModel):
         fk = self.kin.forward_kinematics(self.root, thetas)
         self.init_fk = fk
 
+    def _setup_link_offsets(self):
+        """
+        Stacks links' collision and visual offsets in forward kinematics order
+        """
+        self._link_names = list(self.init_fk.keys())
+        self._collision_offsets = np.array(
+            [self.links[link].collision.offset.h_mat for link in self._link_names]
+        )
+        self._visual_offsets = np.array(
+            [self.links[link].visual.offset.h_mat for link in self._link_names]
+        )
+
     def _get_limited_joints(self):
         """
         Get limit joint
@@ -225,7 +239,7 @@ class Robot(URDFModel):
             thetas (sequence of float): input joint angles
 
         Returns:
-            fk (OrderedDict): transformations
+            fk (dict): transformations
         """
         self._frames = self.root
         fk = self.kin.forward_kinematics(self._frames, thetas)
@@ -2,7 +2,6 @@ import numpy as np
 
 from pykin.robots.robot import Robot
 from pykin.utils.error_utils import NotFoundError
-from pykin.utils.transform_utils import get_pose_from_homogeneous
 
 
 class SingleArm(Robot):
@@ -58,8 +57,9 @@ class SingleArm(Robot):
             limit_cnt += 1
             if limit_cnt > 3:
                 break
+            # reseed inside the joint limits rather than from N(0, 1)
             result_qpos = self.inverse_kin(
-                np.random.randn(len(init_qpos)),
+                self._get_random_qpos(init_qpos),
                 eef_pose,
                 method=method,
                 max_iter=max_iter,
@@ -67,6 +67,50 @@ class SingleArm(Robot):
             is_limit_qpos = self.check_limit_joint(result_qpos)
         return result_qpos
 
+    def _get_desired_joint_limits(self):
+        """
+        Get the limits of every active joint in the desired frames
+
+        Returns:
+            limits_lower (np.array): lower limits, nan if not limited
+            limits_upper (np.array): upper limits, nan if not limited
+        """
+        limits_lower = []
+        limits_upper = []
+        for frame in self.desired_frames:
+            joint = frame.joint
+            if joint.dtype == "fixed":
+                continue
+            limit_lower, limit_upper = joint.limit
+            if limit_lower is None or limit_upper is None:
+                if joint.dtype == "revolute":
+                    limit_lower, limit_upper = -np.pi, np.pi
+                else:
+                    limit_lower, limit_upper = np.nan, np.nan
+            limits_lower.append(limit_lower)
+            limits_upper.append(limit_upper)
+        return np.array(limits_lower, dtype=float), np.array(limits_upper, dtype=float)
+
+    def _get_random_qpos(self, init_qpos):
+        """
+        Get a random qpos inside the joint limits of the desired frames
+
+        Joints without limits keep their value from init_qpos.
+
+        Args:
+            init_qpos (sequence of float): current joint angles
+
+        Returns:
+            qpos (np.array): random joint angles
+        """
+        limits_lower, limits_upper = self._get_desired_joint_limits()
+        is_limited = ~np.isnan(limits_lower)
+        qpos = np.array(init_qpos, dtype=float)[: len(limits_lower)]
+        qpos[is_limited] = np.random.uniform(
+            limits_lower[is_limited], limits_upper[is_limited]
+        )
+        return qpos
+
     def get_info(self, geom="all"):
         if geom == "all":
             return self.info
@@ -89,9 +133,10 @@ class SingleArm(Robot):
         Returns:
             bool(True or False)
         """
-        return np.all(
-            [q_in >= self.joint_limits_lower, q_in <= self.joint_limits_upper]
-        )
+        limits_lower, limits_upper = self._get_desired_joint_limits()
+        limits_lower = np.nan_to_num(limits_lower, nan=-np.inf)
+        limits_upper = np.nan_to_num(limits_upper, nan=np.inf)
+        return np.all([q_in >= limits_lower, q_in <= limits_upper])
 
     def setup_link_name(self, base_name="", eef_name=None):
         """
@@ -160,11 +205,6 @@ class SingleArm(Robot):
         Returns:
             joints (np.array): target joint angles
         """
-        target_pose = np.asarray(target_pose)
-
-        if target_pose.shape == (4, 4):
-            target_pose = get_pose_from_homogeneous(target_pose)
-
         joints = self.kin.inverse_kinematics(
             self.desired_frames, current_joints, target_pose, method, max_iter
         )
@@ -175,7 +215,7 @@ class SingleArm(Robot):
         Get end effector's pose
 
         Args:
-            fk(OrderedDict)
+            fk(dict)
 
         Returns:
             vals(dict)
@@ -190,7 +230,7 @@ class SingleArm(Robot):
         Get end effector's homogeneous marix
 
         Args:
-            fk(OrderedDict)
+            fk(dict)
 
         Returns:
             vals(dict)
@@ -1,3 +1,5 @@
+import functools
+import math
 import numpy as np
 import time
 import trimesh
@@ -14,6 +16,9 @@ LINK_TYPE_MAP = {
 
 LINK_TYPES = ["box", "cylinder", "sphere", "capsule", "mesh"]
 
+# set to False to silence the WorkingTime output of @logging_time functions
+LOGGING_TIME = True
+
 
 class ShellColors:
     COLOR_NC = "\033[0m"  # No Color
@@ -62,7 +67,28 @@ def convert_thetas_to_dict(active_joint_names, thetas):
             thetas
         ), f"""the number of robot joint's angle is {len(active_joint_names)},
                 but the number of input joint's angle is {len(thetas)}"""
-        thetas = dict((j, thetas[i]) for i, j in enumerate(active_joint_names))
+        thetas = dict(zip(active_joint_names, thetas))
+    return thetas
+
+
+def convert_thetas_batch_to_dict(active_joint_names, thetas):
+    """
+    Convert a batch of joint angles to a dictionary of joint angle columns
+
+    Args:
+        active_joint_names (list): actuated joint names
+        thetas (np.array(B, dof)): If not dict, convert to dict ex. {joint names : thetas[:, i]}
+
+    Returns:
+        thetas (dict): Dictionary of actuated joint angles (np.array(B,))
+    """
+    if not isinstance(thetas, dict):
+        thetas = np.atleast_2d(np.asarray(thetas, dtype=np.float64))
+        assert len(active_joint_names) == thetas.shape[1], (
+            f"the number of robot joint's angle is {len(active_joint_names)}, "
+            f"but the number of input joint's angle is {thetas.shape[1]}"
+        )
+        thetas = dict(zip(active_joint_names, thetas.T))
     return thetas
 
 
@@ -71,10 +97,13 @@ def logging_time(original_fn):
     Decorator to check time of function
     """
 
+    @functools.wraps(original_fn)
     def wrapper_fn(*args, **kwargs):
-        start_time = time.time()
+        if not LOGGING_TIME:
+            return original_fn(*args, **kwargs)
+        start_time = time.perf_counter()
         result = original_fn(*args, **kwargs)
-        end_time = time.time()
+        end_time = time.perf_counter()
         print(f"WorkingTime[{original_fn.__name__}]: {end_time-start_time:.4f} sec\n")
         return result
 
@@ -89,7 +118,7 @@ def convert_string_to_narray(str_input):
     Returns:
         np.array: Returns string to np.array
     """
-    return np.array([float(data) for data in str_input.split()])
+    return np.array(str_input.split(), dtype=np.float64)
 
 
 def calc_pose_error(tar_pose, cur_pose, EPS):
@@ -103,23 +132,78 @@ def calc_pose_error(tar_pose, cur_pose, EPS):
         np.array: Returns pose error
     """
 
-    pos_err = np.array([tar_pose[:3, -1] - cur_pose[:3, -1]])
-    rot_err = np.dot(cur_pose[:3, :3].T, tar_pose[:3, :3])
-    w_err = np.dot(cur_pose[:3, :3], rot_to_omega(rot_err, EPS))
+    err = np.empty((6, 1))
+    np.subtract(tar_pose[:3, -1], cur_pose[:3, -1], out=err[:3, 0])
+    cur_rot = cur_pose[:3, :3]
+    rot_err = np.dot(cur_rot.T, tar_pose[:3, :3])
+    np.dot(cur_rot, rot_to_omega(rot_err, EPS), out=err[3:])
 
-    return np.vstack((pos_err.T, w_err))
+    return err
 
 
 def rot_to_omega(R, EPS):
     # referred p36
-    el = np.array([[R[2, 1] - R[1, 2]], [R[0, 2] - R[2, 0]], [R[1, 0] - R[0, 1]]])
-    norm_el = np.linalg.norm(el)
+    (r00, r01, r02), (r10, r11, r12), (r20, r21, r22) = R.tolist()
+    ex, ey, ez = r21 - r12, r02 - r20, r10 - r01
+    norm_el = math.sqrt(ex * ex + ey * ey + ez * ez)
     if norm_el > EPS:
-        w = np.dot(np.arctan2(norm_el, np.trace(R) - 1) / norm_el, el)
-    elif R[0, 0] > 0 and R[1, 1] > 0 and R[2, 2] > 0:
+        scale = math.atan2(norm_el, r00 + r11 + r22 - 1) / norm_el
+        w = np.array([[scale * ex], [scale * ey], [scale * ez]])
+    elif r00 > 0 and r11 > 0 and r22 > 0:
         w = np.zeros((3, 1))
     else:
-        w = np.dot(np.pi / 2, np.array([[R[0, 0] + 1], [R[1, 1] + 1], [R[2, 2] + 1]]))
+        half_pi = math.pi / 2
+        w = np.array(
+            [[half_pi * (r00 + 1)], [half_pi * (r11 + 1)], [half_pi * (r22 + 1)]]
+        )
+    return w
+
+
+def calc_pose_error_batch(tar_pose, cur_poses, EPS):
+    """
+    Args:
+        tar_pos (np.array): target pose
+        cur_poses (np.array(B, 4, 4)): current poses
+        EPS (float): epsilon
+
+    Returns:
+        np.array(B, 6, 1): Returns pose error of each current pose
+    """
+
+    err = np.empty((len(cur_poses), 6, 1))
+    np.subtract(tar_pose[:3, -1], cur_poses[:, :3, -1], out=err[:, :3, 0])
+    cur_rots = cur_poses[:, :3, :3]
+    rot_errs = np.matmul(cur_rots.transpose(0, 2, 1), tar_pose[:3, :3])
+    w = rot_to_omega_batch(rot_errs, EPS)
+    err[:, 3:, 0] = np.einsum("bij,bj->bi", cur_rots, w)
+
+    return err
+
+
+def rot_to_omega_batch(R, EPS):
+    """
+    Args:
+        R (np.array(B, 3, 3)): rotation matrices
+        EPS (float): epsilon
+
+    Returns:
+        np.array(B, 3): Returns angular velocity of each rotation, as rot_to_omega
+    """
+    el = np.stack(
+        (R[:, 2, 1] - R[:, 1, 2], R[:, 0, 2] - R[:, 2, 0], R[:, 1, 0] - R[:, 0, 1]),
+        axis=-1,
+    )
+    norm_el = np.sqrt(np.einsum("bi,bi->b", el, el))
+    diag = np.diagonal(R, axis1=1, axis2=2)
+
+    is_regular = norm_el > EPS
+    scale = np.arctan2(norm_el, diag.sum(axis=1) - 1) / np.where(
+        is_regular, norm_el, 1.0
+    )
+    w = np.where(is_regular[:, None], el * scale[:, None], 0.0)
+
+    is_flipped = ~is_regular & ~np.all(diag > 0, axis=1)
+    w[is_flipped] = np.pi / 2 * (diag[is_flipped] + 1)
     return w
 
 
@@ -136,14 +220,84 @@ def limit_joints(joint_angles, lower, upper):
         joint_angles (sequence of float): Returns limited joint angle
     """
     if lower is not None and upper is not None:
-        for i in range(len(joint_angles)):
-            if joint_angles[i] < lower[i]:
-                joint_angles[i] = lower[i]
-            if joint_angles[i] > upper[i]:
-                joint_angles[i] = upper[i]
+        joint_angles[:] = np.clip(joint_angles, lower, upper)
     return joint_angles
 
 
+@functools.lru_cache(maxsize=256)
+def _create_primitive_mesh(gtype, param, color):
+    """
+    Creates a primitive mesh's arrays, cached (bounded) by its hashable parameters
+
+    Args:
+        gtype (str): primitive type ("box", "cylinder" or "sphere")
+        param (tuple of float): box extents, cylinder (height, radius) or (sphere radius,)
+        color (tuple of float or int): rgba face color, or None
+
+    Returns:
+        vertices (np.array): read-only vertices shared by every caller
+        faces (np.array): read-only faces shared by every caller
+        face_colors (np.array): read-only face colors, or None
+    """
+    if gtype == "box":
+        mesh = trimesh.creation.box(extents=param)
+    elif gtype == "cylinder":
+        mesh = trimesh.creation.cylinder(height=param[0], radius=param[1])
+    else:
+        mesh = trimesh.creation.icosphere(radius=param[0])
+    face_colors = None
+    if color is not None:
+        mesh.visual.face_colors = color
+        face_colors = np.array(mesh.visual.face_colors)
+    arrays = (np.array(mesh.vertices), np.array(mesh.faces), face_colors)
+    for array in arrays:
+        if array is not None:
+            array.flags.writeable = False
+    return arrays
+
+
+def _get_primitive_mesh(gtype, param, color=None):
+    """
+    Returns a new primitive mesh built from the cached arrays of its shape parameters
+
+    Args:
+        gtype (str): primitive type ("box", "cylinder" or "sphere")
+        param (float or sequence of float): box extents, cylinder (height, radius)
+                                            or sphere radius
+        color (sequence of float or int): rgba face color, cached with the mesh
+
+    Returns:
+        trimesh.Trimesh: primitive mesh
+    """
+    # rounded so that parameters differing only by float noise share a mesh
+    param = tuple(np.round(np.ravel(param).astype(float), 6).tolist())
+    if color is not None:
+        color = tuple(np.ravel(color).tolist())
+    vertices, faces, face_colors = _create_primitive_mesh(gtype, param, color)
+    # trimesh keeps vertices and faces without copying them, face colors are copied
+    return trimesh.Trimesh(
+        vertices.copy(), faces.copy(), face_colors=face_colors, process=False
+    )
+
+
+def _set_face_colors(mesh, color):
+    """
+    Set the mesh's face colors, skipping meshes whose faces already all have this color
+
+    Args:
+        mesh (trimesh.Trimesh): mesh to color
+        color (sequence of float or int): rgba color
+    """
+    visual = mesh.visual
+    if visual.kind == "face":
+        rgba = trimesh.visual.color.to_rgba(color)
+        # compare each face's rgba as one packed uint32
+        face_colors = np.ascontiguousarray(visual.face_colors).view(np.uint32)
+        if rgba.shape == (4,) and (face_colors == rgba.view(np.uint32)).all():
+            return
+    visual.face_colors = color
+
+
 def apply_objects_to_scene(trimesh_scene=None, objs=None):
     if trimesh_scene is None:
         trimesh_scene = trimesh.Scene()
@@ -154,22 +308,19 @@ def apply_objects_to_scene(trimesh_scene=None, objs=None):
 
         if info.gtype == "mesh":
             mesh = info.gparam
-            mesh.visual.face_colors = color
+            _set_face_colors(mesh, color)
             trimesh_scene.add_geometry(mesh, transform=info.h_mat)
 
         if info.gtype == "box":
-            box_mesh = trimesh.creation.box(extents=info.gparam)
-            box_mesh.visual.face_colors = color
+            box_mesh = _get_primitive_mesh("box", info.gparam, color)
             trimesh_scene.add_geometry(box_mesh, transform=info.h_mat)
 
         if info.gtype == "cylinder":
-            capsule_mesh = trimesh.creation.cylinder(height=info.gparam[0], radius=info.gparam[1])
-            capsule_mesh.visual.face_colors = color
+            capsule_mesh = _get_primitive_mesh("cylinder", info.gparam, color)
             trimesh_scene.add_geometry(capsule_mesh, transform=info.h_mat)
 
         if info.gtype == "sphere":
-            sphere_mesh = trimesh.creation.icosphere(radius=info.gparam)
-            sphere_mesh.visual.face_colors = color
+            sphere_mesh = _get_primitive_mesh("sphere", info.gparam, color)
             trimesh_scene.add_geometry(sphere_mesh, transform=info.h_mat)
 
     return trimesh_scene
@@ -192,34 +343,31 @@ def apply_gripper_to_scene(trimesh_scene=None, robot=None, geom="collision"):
                     mesh_color = p_utils.get_mesh_color(robot, link, geom, idx=idx)
                     if len(info) > 4:
                         mesh_color = info[4]
-                    mesh.visual.face_colors = mesh_color
+                    _set_face_colors(mesh, mesh_color)
                     trimesh_scene.add_geometry(mesh, transform=h_mat)
             else:
                 mesh_color = p_utils.get_mesh_color(robot, link, geom)
                 if len(info) > 4:
                     mesh_color = info[4]
-                mesh.visual.face_colors = mesh_color
+                _set_face_colors(mesh, mesh_color)
                 trimesh_scene.add_geometry(mesh, transform=h_mat)
 
         if info[1] == "box":
             for idx, param in enumerate(info[2]):
-                box_mesh = trimesh.creation.box(extents=param)
                 box_color = p_utils.get_mesh_color(robot, link, geom, idx)
-                box_mesh.visual.face_colors = box_color
+                box_mesh = _get_primitive_mesh("box", param, box_color)
                 trimesh_scene.add_geometry(box_mesh, transform=h_mat)
 
         if info[1] == "cylinder":
             for idx, param in enumerate(info[2]):
-                capsule_mesh = trimesh.creation.cylinder(height=param[0], radius=param[1])
                 capsule_color = p_utils.get_mesh_color(robot, link, geom, idx)
-                capsule_mesh.visual.face_colors = capsule_color
+                capsule_mesh = _get_primitive_mesh("cylinder", param, capsule_color)
                 trimesh_scene.add_geometry(capsule_mesh, transform=h_mat)
 
         if info[1] == "sphere":
             for idx, param in enumerate(info[2]):
-                sphere_mesh = trimesh.creation.icosphere(radius=param)
                 sphere_color = p_utils.get_mesh_color(robot, link, geom, idx)
-                sphere_mesh.visual.face_colors = sphere_color
+                sphere_mesh = _get_primitive_mesh("sphere", param, sphere_color)
                 trimesh_scene.add_geometry(sphere_mesh, transform=h_mat)
     return trimesh_scene
 
@@ -238,34 +386,31 @@ def apply_robot_to_scene(trimesh_scene=None, robot=None, geom="collision"):
                     mesh_color = p_utils.get_mesh_color(robot, link, geom, idx)
                     if len(info) > 4:
                         mesh_color = info[4]
-                    mesh.visual.face_colors = mesh_color
+                    _set_face_colors(mesh, mesh_color)
                     trimesh_scene.add_geometry(mesh, transform=h_mat)
             else:
                 mesh_color = p_utils.get_mesh_color(robot, link, geom)
                 if len(info) > 4:
                     mesh_color = info[4]
-                mesh.visual.face_colors = mesh_color
+                _set_face_colors(mesh, mesh_color)
                 trimesh_scene.add_geometry(mesh, transform=h_mat)
 
         if info[1] == "box":
             for idx, param in enumerate(info[2]):
-                box_mesh = trimesh.creation.box(extents=param)
                 box_color = p_utils.get_mesh_color(robot, link, geom, idx)
-                box_mesh.visual.face_colors = box_color
+                box_mesh = _get_primitive_mesh("box", param, box_color)
                 trimesh_scene.add_geometry(box_mesh, transform=h_mat)
 
         if info[1] == "cylinder":
             for idx, param in enumerate(info[2]):
-                capsule_mesh = trimesh.creation.cylinder(height=param[0], radius=param[1])
                 capsule_color = p_utils.get_mesh_color(robot, link, geom, idx)
-                capsule_mesh.visual.face_colors = capsule_color
+                capsule_mesh = _get_primitive_mesh("cylinder", param, capsule_color)
                 trimesh_scene.add_geometry(capsule_mesh, transform=h_mat)
 
         if info[1] == "sphere":
             for idx, param in enumerate(info[2]):
-                sphere_mesh = trimesh.creation.icosphere(radius=param)
                 sphere_color = p_utils.get_mesh_color(robot, link, geom, idx)
-                sphere_mesh.visual.face_colors = sphere_color
+                sphere_mesh = _get_primitive_mesh("sphere", param, sphere_color)
                 trimesh_scene.add_geometry(sphere_mesh, transform=h_mat)
     return trimesh_scene
 
@@ -273,7 +418,7 @@ def apply_robot_to_scene(trimesh_scene=None, robot=None, geom="collision"):
 def get_mesh_param(link_type):
     file_name = str(link_type.gparam.get("filename"))
     color = link_type.gparam.get("color")
-    color = np.array([color for color in color.values()]).flatten()
+    color = np.concatenate(list(color.values()))
     return (file_name, color)
 
 
@@ -283,11 +428,15 @@ def get_cylinder_param(link_type):
     return (radius, length)
 
 
-def get_spehre_param(link_type):
+def get_sphere_param(link_type):
     radius = float(link_type.gparam.get("radius"))
     return radius
 
 
+# misspelled name kept for backward compatibility
+get_spehre_param = get_sphere_param
+
+
 def get_box_param(link_type):
     size = list(link_type.gparam.get("size"))
     return size
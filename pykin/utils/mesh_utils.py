@@ -1,7 +1,6 @@
-import os, io, datetime
+import os, io, datetime, math
 import trimesh
 import numpy as np
-from copy import deepcopy
 from PIL import Image
 from pykin.utils import transform_utils as t_utils
 from pykin.utils.plot_utils import createDirectory
@@ -25,12 +24,16 @@ def get_object_mesh(mesh_name, scale=[1.0, 1.0, 1.0]):
 
 
 def get_mesh_bounds(mesh, pose=np.eye(4)):
-    copied_mesh = deepcopy(mesh)
-    copied_mesh.apply_transform(pose)
-    return copied_mesh.bounds
+    vertices = np.dot(mesh.vertices, pose[:3, :3].T) + pose[:3, 3]
+    return np.array([vertices.min(axis=0), vertices.max(axis=0)])
 
 
 def normalize(vec):
+    vec = np.asarray(vec)
+    if vec.shape == (3,):
+        # scalar math avoids np.linalg.norm's overhead on 3-vectors
+        x, y, z = vec.tolist()
+        return vec / math.sqrt(x * x + y * y + z * z)
     return vec / np.linalg.norm(vec)
 
 
@@ -49,13 +52,13 @@ def projection(v, u):
 def get_absolute_transform(A, B):
     # TA = B
     # T = B * inv(A)
-    return np.dot(B, np.linalg.inv(A))
+    return np.dot(B, t_utils.get_inverse_homogeneous(A))
 
 
 def get_relative_transform(A, B):
     # AT = B
     # T = inv(A) * B
-    return np.dot(np.linalg.inv(A), B)
+    return np.dot(t_utils.get_inverse_homogeneous(A), B)
 
 
 def get_grasp_directions(line, n_trials):
@@ -69,30 +72,36 @@ def get_grasp_directions(line, n_trials):
         n_trials (int): parameter to obtain grasp poses by 360/n_trials angle around a pair of contact points
 
     Returns:
-        normal_dir (float): grasp direction
+        normal_dir (np.array(3,)): grasp direction, yielded one at a time
     """
     norm_vector = normalize(line)
     e1, e2 = np.eye(3)[:2]
-    v1 = e1 - projection(e1, norm_vector)
+    # norm_vector and v1 are unit, so projecting e_i onto them is a scale by
+    # their i-th component
+    v1 = e1 - norm_vector[0] * norm_vector
     v1 = normalize(v1)
-    v2 = e2 - projection(e2, norm_vector) - projection(e2, v1)
+    v2 = e2 - norm_vector[1] * norm_vector - v1[1] * v1
     v2 = normalize(v2)
 
-    for theta in np.linspace(0, np.pi, n_trials):
-        normal_dir = np.cos(theta) * v1 + np.sin(theta) * v2
+    thetas = np.linspace(0, np.pi, n_trials)
+    normal_dirs = np.outer(np.cos(thetas), v1) + np.outer(np.sin(thetas), v2)
+    for normal_dir in normal_dirs:
         yield normal_dir
 
 
 def get_rotation_from_vectors(A, B):
-    unit_A = A / np.linalg.norm(A)
-    unit_B = B / np.linalg.norm(B)
+    unit_A = normalize(A)
+    unit_B = normalize(B)
     dot_product = np.dot(unit_A, unit_B)
-
-    angle = np.arccos(dot_product)
     rot_axis = np.cross(unit_B, unit_A)
+    x, y, z = rot_axis.tolist()
+    sin_angle = math.sqrt(x * x + y * y + z * z)
+
+    # atan2 stays finite when rounding pushes the dot product past +-1
+    angle = np.arctan2(sin_angle, dot_product)
 
     if np.any(rot_axis, 0):
-        unit_rot_axis = rot_axis / np.linalg.norm(rot_axis)
+        unit_rot_axis = rot_axis / sin_angle
         R = t_utils.get_matrix_from_axis_angle(unit_rot_axis, angle)
     else:
         R = t_utils.get_matrix_from_axis_angle(rot_axis, angle)
@@ -244,22 +244,15 @@ def plot_robot(
     if robot.has_gripper and robot.gripper.is_attached:
         plot_attached_object(ax, robot, alpha)
 
-    links = []
     nodes = []
-    transformation_matrix = []
-
-    for i, (link, info) in enumerate(robot.info[geom].items()):
+    eef_idx = 0
+    for link, info in robot.info[geom].items():
         if name != "baxter":
             if "pedestal" in link or "controller_box" in link or "tcp" in link:
                 continue
-        links.append(link)
-        transformation_matrix.append(info[3])
-
-    eef_idx = 0
-    for i, (link, matrix) in enumerate(zip(links, transformation_matrix)):
-        nodes.append(t_utils.get_pos_mat_from_homogeneous(matrix))
         if link == robot.eef_name:
-            eef_idx = i
+            eef_idx = len(nodes)
+        nodes.append(t_utils.get_pos_mat_from_homogeneous(info[3]))
 
     if name == "baxter":
         _plot_baxter(ax, nodes, visible_text, visible_scatter)
@@ -294,13 +287,8 @@ def plot_robot(
 
 
 def plot_attached_object(ax, robot, alpha):
-    plot_mesh(
-        ax,
-        mesh=robot.gripper.info[robot.gripper.attached_obj_name][2],
-        h_mat=robot.gripper.info[robot.gripper.attached_obj_name][3],
-        alpha=alpha,
-        color=robot.gripper.info[robot.gripper.attached_obj_name][4],
-    )
+    info = robot.gripper.info[robot.gripper.attached_obj_name]
+    plot_mesh(ax, mesh=info[2], h_mat=info[3], alpha=alpha, color=info[4])
 
 
 def plot_geom(ax, robot, geom="collision", alpha=0.4, color=None):
@@ -450,34 +438,22 @@ def get_mesh_color(robot, link, geom, idx=0, color=None):
             if robot_link:
                 if robot_link.collision.gparam.get("color"):
                     mesh_color = robot_link.collision.gparam.get("color")[idx]
-                    mesh_color = np.array(
-                        [color for color in mesh_color.values()]
-                    ).flatten()
+                    mesh_color = np.concatenate(list(mesh_color.values()))
             else:
                 if robot.has_gripper:
-                    if (
-                        robot.gripper.info.get(robot.gripper.attached_obj_name)
-                        is not None
-                    ):
-                        mesh_color = robot.gripper.info.get(
-                            robot.gripper.attached_obj_name
-                        )[4]
+                    info = robot.gripper.info.get(robot.gripper.attached_obj_name)
+                    if info is not None:
+                        mesh_color = info[4]
         else:
             if robot_link:
                 if robot_link.visual.gparam.get("color"):
                     mesh_color = robot_link.visual.gparam.get("color")[idx]
-                    mesh_color = np.array(
-                        [color for color in mesh_color.values()]
-                    ).flatten()
+                    mesh_color = np.concatenate(list(mesh_color.values()))
                 else:
                     if robot.has_gripper:
-                        if (
-                            robot.gripper.info.get(robot.gripper.attached_obj_name)
-                            is not None
-                        ):
-                            mesh_color = robot.gripper.info.get(
-                                robot.gripper.attached_obj_name
-                            )[4]
+                        info = robot.gripper.info.get(robot.gripper.attached_obj_name)
+                        if info is not None:
+                            mesh_color = info[4]
     return mesh_color
 
 
@@ -618,10 +594,8 @@ def plot_mesh(
     alpha=1.0,
     color="k",
 ):
-    vertices = mesh.vertices * s
-    vertices = np.hstack((vertices, np.ones((len(vertices), 1))))
-    vertices = np.dot(vertices, h_mat.T)[:, :3]
-    vectors = np.array([vertices[[i, j, k]] for i, j, k in mesh.faces])
+    vertices = np.dot(mesh.vertices * s, h_mat[:3, :3].T) + h_mat[:3, 3]
+    vectors = vertices[mesh.faces]
 
     surface = Poly3DCollection(vectors)
     surface.set_facecolor(color)
@@ -158,19 +158,40 @@ def get_quaternion_from_rpy(rpy, convention="wxyz"):
 def get_quaternion_from_matrix(R, convention="wxyz"):
     """
     Returns quaternion from rotation matrix
-    """
-    w = 1.0 / 2 * np.sqrt(R[0, 0] + R[1, 1] + R[2, 2] + 1)
-    x, y, z = (
-        1.0
-        / 2
-        * np.array(
-            [
-                np.sign(R[2, 1] - R[1, 2]) * np.sqrt(R[0, 0] - R[1, 1] - R[2, 2] + 1),
-                np.sign(R[0, 2] - R[2, 0]) * np.sqrt(R[1, 1] - R[2, 2] - R[0, 0] + 1),
-                np.sign(R[1, 0] - R[0, 1]) * np.sqrt(R[2, 2] - R[0, 0] - R[1, 1] + 1),
-            ]
-        )
-    )
+
+    Uses Shepperd's method (branch on the largest diagonal term),
+    so the result stays accurate near 180 degree rotations.
+    The scalar part is always non-negative.
+    """
+    (r00, r01, r02), (r10, r11, r12), (r20, r21, r22) = R[:3, :3].tolist()
+    trace = r00 + r11 + r22
+    if trace > 0.0:
+        s = 2.0 * math.sqrt(trace + 1.0)
+        w = 0.25 * s
+        x = (r21 - r12) / s
+        y = (r02 - r20) / s
+        z = (r10 - r01) / s
+    elif r00 > r11 and r00 > r22:
+        s = 2.0 * math.sqrt(1.0 + r00 - r11 - r22)
+        w = (r21 - r12) / s
+        x = 0.25 * s
+        y = (r01 + r10) / s
+        z = (r02 + r20) / s
+    elif r11 > r22:
+        s = 2.0 * math.sqrt(1.0 + r11 - r00 - r22)
+        w = (r02 - r20) / s
+        x = (r01 + r10) / s
+        y = 0.25 * s
+        z = (r12 + r21) / s
+    else:
+        s = 2.0 * math.sqrt(1.0 + r22 - r00 - r11)
+        w = (r10 - r01) / s
+        x = (r02 + r20) / s
+        y = (r12 + r21) / s
+        z = 0.25 * s
+
+    if w < 0.0:
+        w, x, y, z = -w, -x, -y, -z
 
     if convention == "xyzw":
         return np.array([x, y, z, w])
@@ -210,6 +231,8 @@ def get_quaternion_inverse(quaternion):
 def get_quaternion_slerp(qA, qB, t):
     """
     referred https://en.wikipedia.org/wiki/Slerp#Quaternion_Slerp
+
+    Interpolates along the shortest arc, as get_quaternion_slerp_batch with one step
     """
     if isinstance(qA, (np.ndarray, list)) and isinstance(qB, (np.ndarray, list)):
         qA = np.asarray(qA)
@@ -219,9 +242,40 @@ def get_quaternion_slerp(qA, qB, t):
         if qB.shape == (0,):
             qB = np.asarray([1.0, 0.0, 0.0, 0.0])
 
-        a = qB * get_quaternion_inverse(qA)
-        result = np.sign(a) * (np.abs(a)) ** t * qA
-        return result
+        return get_quaternion_slerp_batch(qA, qB, t)
+
+
+def get_quaternion_slerp_batch(qA, qB, steps):
+    """
+    Returns spherical linear interpolations between two quaternions at once
+
+    Args:
+        qA (np.array): start quaternion
+        qB (np.array): goal quaternion
+        steps (float or np.array(n,)): interpolation parameter(s) in [0, 1]
+
+    Returns:
+        np.array(n, 4): interpolated unit quaternions along the shortest arc
+            (np.array(4,) if steps is a float)
+    """
+    qA = np.asarray(qA, dtype=np.float64)
+    qB = np.asarray(qB, dtype=np.float64)
+    qA = qA / np.linalg.norm(qA)
+    qB = qB / np.linalg.norm(qB)
+    steps = np.asarray(steps, dtype=np.float64)[..., None]
+
+    dot = np.dot(qA, qB)
+    qB = np.copysign(1.0, dot) * qB
+    dot = abs(dot)
+
+    # nearly parallel: normalized linear interpolation avoids dividing by sin(0)
+    if dot > 0.9995:
+        q = qA + steps * (qB - qA)
+        return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+    theta = math.acos(min(dot, 1.0))
+    sin_theta = math.sin(theta)
+    return (np.sin((1.0 - steps) * theta) * qA + np.sin(steps * theta) * qB) / sin_theta
 
 
 def get_linear_interpoation(postionA, postionB, step):
@@ -270,6 +324,10 @@ def quaternion_multiply(quaternion1, quaternion0):
 # epsilon for testing whether a number is close to zero
 _EPS = np.finfo(float).eps * 4.0
 
+# read-only identity, never returned to callers
+_IDENTITY = np.identity(4)
+_IDENTITY.flags.writeable = False
+
 
 def get_quaternion_about_axis(angle, axis):
     """
@@ -305,8 +363,11 @@ def get_inverse_homogeneous(matrix):
     Returns homogeneous inverse
     """
     R = matrix[:3, :3].T
-    p = -R.dot(matrix[:3, 3].reshape(-1, 1))
-    return np.vstack((np.hstack((R, p)), np.array([[0, 0, 0, 1]])))
+    inv = np.zeros((4, 4))
+    inv[:3, :3] = R
+    inv[:3, 3] = -np.dot(R, matrix[:3, 3])
+    inv[3, 3] = 1.0
+    return inv
 
 
 def get_identity_h_mat():
@@ -411,7 +472,7 @@ def compute_pose_error(target=np.eye(4), result=np.eye(4)):
         # target = get_h_mat(position = target)
         # result = get_h_mat(position = result)
         return error
-    error = np.linalg.norm(np.dot(result, np.linalg.inv(target)) - np.mat(np.eye(4)))
+    error = np.linalg.norm(np.dot(result, np.linalg.inv(target)) - _IDENTITY)
     return error
 
 
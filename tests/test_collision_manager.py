@@ -0,0 +1,152 @@
+import itertools
+
+import numpy as np
+import pytest
+
+fcl = pytest.importorskip("fcl")
+
+from pykin.collision.collision_manager import CollisionManager
+from pykin.kinematics.transform import Transform
+from pykin.robots.single_arm import SingleArm
+
+
+@pytest.fixture(scope="module")
+def sawyer():
+    robot = SingleArm(
+        "urdf/sawyer/sawyer.urdf", Transform(rot=[0.0, 0.0, 0.0], pos=[0, 0, 0])
+    )
+    robot.setup_link_name(eef_name="sawyer_right_hand")
+    return robot
+
+
+def _robot_manager(robot, thetas):
+    robot.set_transform(thetas)
+    c_manager = CollisionManager(is_robot=True)
+    c_manager.setup_robot_collision(robot, geom="collision")
+    return c_manager
+
+
+def test_get_distances_internal_matches_ordered_pairs(sawyer):
+    c_manager = _robot_manager(
+        sawyer, np.array([0.0, 0.5, 0.0, -1.2, 0.0, 1.0, 0.0, 0])
+    )
+
+    expected = {}
+    for (o1, o2) in itertools.permutations(c_manager._objs, 2):
+        if (o1, o2) in c_manager.filtered_link_names:
+            continue
+        expected[(o1, o2)] = fcl.distance(
+            c_manager._objs[o1]["obj"],
+            c_manager._objs[o2]["obj"],
+            fcl.DistanceRequest(),
+            fcl.DistanceResult(),
+        )
+
+    result = c_manager.get_distances_internal()
+    assert list(result) == list(expected)
+    # each unordered pair is computed once, in one argument order
+    np.testing.assert_allclose(
+        list(result.values()), list(expected.values()), atol=1e-4
+    )
+
+
+def _object_transforms(c_manager):
+    return {
+        name: np.hstack(
+            (info["obj"].getRotation(), info["obj"].getTranslation()[:, None])
+        )
+        for name, info in c_manager._objs.items()
+    }
+
+
+def _assert_same_transforms(c_manager, other):
+    transforms, other_transforms = (
+        _object_transforms(c_manager),
+        _object_transforms(other),
+    )
+    assert list(transforms) == list(other_transforms)
+    for name, transform in transforms.items():
+        np.testing.assert_allclose(transform, other_transforms[name], atol=1e-12)
+
+
+def test_set_robot_transforms_matches_set_transform(sawyer):
+    init_thetas = np.zeros(8)
+    thetas = np.array([0.3, -0.4, 0.2, 1.1, -0.5, 0.8, 0.1, 0])
+
+    per_object = _robot_manager(sawyer, init_thetas)
+    batched = _robot_manager(sawyer, init_thetas)
+
+    sawyer.set_transform(thetas)
+    for link, info in sawyer.info[per_object.geom].items():
+        if link in per_object._objs:
+            per_object.set_transform(name=link, h_mat=info[3])
+    batched.set_robot_transforms(sawyer)
+
+    _assert_same_transforms(batched, per_object)
+    assert batched.in_collision_internal(
+        return_names=True
+    ) == per_object.in_collision_internal(return_names=True)
+
+
+def test_set_transforms_matches_set_transform():
+    def box_manager():
+        c_manager = CollisionManager()
+        c_manager.add_object("box1", "box", (0.2, 0.2, 0.2), np.eye(4))
+        c_manager.add_object(
+            "box2", "box", (0.2, 0.2, 0.2), Transform(pos=[1, 0, 0]).h_mat
+        )
+        c_manager.add_object(
+            "box3", "box", (0.2, 0.2, 0.2), Transform(pos=[2, 0, 0]).h_mat
+        )
+        return c_manager
+
+    h_mats = {
+        "box2": Transform(rot=[0.0, 0.0, 0.3], pos=[0.1, 0, 0]).h_mat,
+        "box3": Transform(pos=[0, 0, 2]).h_mat,
+    }
+    per_object, batched = box_manager(), box_manager()
+    assert not batched.in_collision_internal()
+
+    for name, h_mat in h_mats.items():
+        per_object.set_transform(name, h_mat)
+    batched.set_transforms(h_mats)
+
+    _assert_same_transforms(batched, per_object)
+    assert batched.in_collision_internal(return_names=True) == (
+        per_object.in_collision_internal(return_names=True)
+    )
+    assert batched.in_collision_internal(return_names=True)[1] == {("box1", "box2")}
+
+    with pytest.raises(ValueError):
+        batched.set_transforms({"missing": np.eye(4)})
+
+
+def test_snapshot_restore(sawyer):
+    c_manager = _robot_manager(sawyer, np.zeros(8))
+    reference = _robot_manager(sawyer, np.zeros(8))
+    snap = c_manager.snapshot()
+
+    sawyer.set_transform(np.array([0.3, -0.4, 0.2, 1.1, -0.5, 0.8, 0.1, 0]))
+    c_manager.set_robot_transforms(sawyer)
+    moved = _object_transforms(c_manager)
+    assert any(
+        not np.allclose(moved[name], transform)
+        for name, transform in _object_transforms(reference).items()
+    )
+
+    c_manager.restore(snap)
+    _assert_same_transforms(c_manager, reference)
+    assert c_manager.in_collision_internal(
+        return_names=True
+    ) == reference.in_collision_internal(return_names=True)
+
+
+def test_setup_filter_holds_after_moving(sawyer):
+    # links touching at setup stay filtered once set_transform moves them in float64
+    c_manager = _robot_manager(sawyer, np.zeros(8))
+    sawyer.set_transform(np.array([0.3, -0.4, 0.2, 1.1, -0.5, 0.8, 0.1, 0]))
+    c_manager.set_robot_transforms(sawyer)
+    is_collision, names = c_manager.in_collision_internal(return_names=True)
+    assert not is_collision or (
+        ("sawyer_link_0", "sawyer_right_arm_base_link") not in names
+    )
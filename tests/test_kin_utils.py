@@ -0,0 +1,94 @@
+import numpy as np
+import trimesh
+
+from pykin.utils import kin_utils as k_utils
+from pykin.utils import transform_utils as t_utils
+
+EPS = 1e-12
+
+
+def _rotations():
+    rng = np.random.RandomState(0)
+    rotations = [
+        t_utils.get_matrix_from_axis_angle(axis / np.linalg.norm(axis), angle)
+        for axis, angle in zip(rng.randn(10, 3), rng.uniform(-3, 3, 10))
+    ]
+    # identity, exact 180 degree turns and nearly 180 degree turns
+    rotations.append(np.eye(3))
+    for axis in np.eye(3):
+        rotations.append(t_utils.get_matrix_from_axis_angle(axis, np.pi))
+        rotations.append(t_utils.get_matrix_from_axis_angle(axis, np.pi - 1e-6))
+    return np.array(rotations)
+
+
+def test_rot_to_omega_batch_matches_scalar():
+    rotations = _rotations()
+    expected = np.array([k_utils.rot_to_omega(R, EPS)[:, 0] for R in rotations])
+    np.testing.assert_allclose(k_utils.rot_to_omega_batch(rotations, EPS), expected)
+
+    # the identity and flipped branches are both hit
+    np.testing.assert_array_equal(expected[10], np.zeros(3))
+    np.testing.assert_allclose(expected[11], [np.pi, 0.0, 0.0])
+
+
+def test_calc_pose_error_batch_matches_scalar():
+    rng = np.random.RandomState(1)
+    tar_pose = np.eye(4)
+    tar_pose[:3, :3] = t_utils.get_matrix_from_axis_angle(
+        np.array([0.0, 0.6, 0.8]), 0.9
+    )
+    tar_pose[:3, 3] = [0.3, -0.2, 0.5]
+
+    cur_poses = np.tile(np.eye(4), (len(_rotations()) + 1, 1, 1))
+    cur_poses[:-1, :3, :3] = np.matmul(tar_pose[:3, :3], _rotations())
+    cur_poses[:-1, :3, 3] = rng.randn(len(cur_poses) - 1, 3)
+    # the target itself gives a zero error
+    cur_poses[-1] = tar_pose
+
+    expected = np.array(
+        [k_utils.calc_pose_error(tar_pose, cur_pose, EPS) for cur_pose in cur_poses]
+    )
+    errors = k_utils.calc_pose_error_batch(tar_pose, cur_poses, EPS)
+    assert errors.shape == (len(cur_poses), 6, 1)
+    np.testing.assert_allclose(errors, expected, atol=1e-12)
+    np.testing.assert_allclose(errors[-1], 0.0, atol=1e-12)
+
+
+def test_convert_thetas_batch_to_dict_matches_scalar():
+    names = ["joint1", "joint2", "joint3"]
+    thetas = np.arange(12.0).reshape(4, 3)
+
+    result = k_utils.convert_thetas_batch_to_dict(names, thetas)
+    assert list(result) == names
+    for b, row in enumerate(thetas):
+        expected = k_utils.convert_thetas_to_dict(names, row)
+        assert {name: column[b] for name, column in result.items()} == expected
+
+    # a single row and a dict pass through like the scalar helper
+    assert list(k_utils.convert_thetas_batch_to_dict(names, thetas[0])["joint2"]) == [
+        1.0
+    ]
+    thetas_dict = {"joint1": np.zeros(2)}
+    assert k_utils.convert_thetas_batch_to_dict(names, thetas_dict) is thetas_dict
+
+
+def test_get_primitive_mesh_is_not_shared():
+    color = [255, 0, 0, 255]
+    expected = trimesh.creation.icosphere(radius=0.05)
+    expected.visual.face_colors = color
+
+    mesh = k_utils._get_primitive_mesh("sphere", 0.05, color)
+    np.testing.assert_array_equal(mesh.vertices, expected.vertices)
+    np.testing.assert_array_equal(mesh.faces, expected.faces)
+    np.testing.assert_array_equal(mesh.visual.face_colors, expected.visual.face_colors)
+
+    # mutating a returned mesh must not poison the cache
+    mesh.vertices[0] += 1.0
+    mesh.faces[0] = mesh.faces[0][::-1]
+    mesh.visual.face_colors[0] = [0, 255, 0, 255]
+    mesh.apply_translation([1.0, 2.0, 3.0])
+
+    mesh = k_utils._get_primitive_mesh("sphere", 0.05, color)
+    np.testing.assert_array_equal(mesh.vertices, expected.vertices)
+    np.testing.assert_array_equal(mesh.faces, expected.faces)
+    np.testing.assert_array_equal(mesh.visual.face_colors, expected.visual.face_colors)
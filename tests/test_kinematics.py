@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+
+from pykin.kinematics.kinematics import FKPlan, Kinematics
+from pykin.kinematics.transform import Transform
+from pykin.robots.single_arm import SingleArm
+from pykin.robots.bimanual import Bimanual
+from pykin.utils.kin_utils import calc_pose_error
+
+
+@pytest.fixture(scope="module")
+def panda():
+    robot = SingleArm(
+        "urdf/panda/panda.urdf", Transform(rot=[0.0, 0.0, 0.0], pos=[0, 0, 0])
+    )
+    robot.setup_link_name("panda_link_0", "right_hand")
+    return robot
+
+
+@pytest.fixture(scope="module")
+def baxter():
+    robot = Bimanual(
+        "urdf/baxter/baxter.urdf", Transform(rot=[0.0, 0.0, 0.0], pos=[0, 0, 0])
+    )
+    robot.setup_link_name("base", "right_wrist")
+    robot.setup_link_name("base", "left_wrist")
+    return robot
+
+
+def test_update_h_mats_chain(panda):
+    rng = np.random.RandomState(0)
+    plan = FKPlan(panda.desired_frames)
+    base_h_mat = panda.offset.h_mat
+    dof = len(plan.active_idx)
+
+    q = rng.uniform(-1, 1, dof)
+    np.testing.assert_allclose(
+        plan.update_h_mats(base_h_mat, q), plan.compute_h_mats(base_h_mat, q)
+    )
+
+    # only the subtree of a changed joint is recomputed
+    for joint in (0, 3, dof - 1):
+        q[joint] += 0.3
+        np.testing.assert_allclose(
+            plan.update_h_mats(base_h_mat, q, dirty_joints=[joint]),
+            plan.compute_h_mats(base_h_mat, q),
+        )
+        q[joint] -= 0.5
+        np.testing.assert_allclose(
+            plan.update_h_mats(base_h_mat, q), plan.compute_h_mats(base_h_mat, q)
+        )
+
+    # a changed base pose recomputes everything
+    moved_base = Transform(rot=[0.1, 0.2, 0.3], pos=[0.5, -0.2, 0.1]).h_mat
+    np.testing.assert_allclose(
+        plan.update_h_mats(moved_base, q), plan.compute_h_mats(moved_base, q)
+    )
+
+    # every joint changed
+    q = rng.uniform(-1, 1, dof)
+    np.testing.assert_allclose(
+        plan.update_h_mats(moved_base, q, dirty_joints=range(dof)),
+        plan.compute_h_mats(moved_base, q),
+    )
+
+
+def test_update_h_mats_tree(baxter):
+    rng = np.random.RandomState(1)
+    plan = FKPlan(baxter.root)
+    base_h_mat = baxter.offset.h_mat
+    names = baxter.kin.active_joint_names
+
+    thetas = dict(zip(names, rng.uniform(-1, 1, len(names))))
+    np.testing.assert_allclose(
+        plan.update_h_mats(base_h_mat, thetas), plan.compute_h_mats(base_h_mat, thetas)
+    )
+
+    # a joint on one arm must not disturb the other branch
+    for name in (names[0], names[1], names[-1]):
+        thetas[name] += 0.4
+        np.testing.assert_allclose(
+            plan.update_h_mats(base_h_mat, thetas),
+            plan.compute_h_mats(base_h_mat, thetas),
+        )
+
+    moved_base = Transform(rot=[0.0, 0.0, 0.5], pos=[1.0, 0.0, 0.0]).h_mat
+    np.testing.assert_allclose(
+        plan.update_h_mats(moved_base, thetas), plan.compute_h_mats(moved_base, thetas)
+    )
+
+    thetas = dict(zip(names, rng.uniform(-1, 1, len(names))))
+    np.testing.assert_allclose(
+        plan.update_h_mats(moved_base, thetas), plan.compute_h_mats(moved_base, thetas)
+    )
+
+
+def _assert_batch_matches(kin, frames, thetas):
+    fk_batch = kin.forward_kinematics_batch(frames, thetas)
+    for b, q in enumerate(thetas):
+        fk = kin.forward_kinematics(frames, q)
+        assert list(fk_batch) == list(fk)
+        for name, transform in fk.items():
+            np.testing.assert_allclose(fk_batch[name][b], transform.h_mat, atol=1e-10)
+
+
+def test_forward_kinematics_batch_chain(panda):
+    thetas = np.random.RandomState(2).uniform(-1, 1, (5, panda.arm_dof))
+    _assert_batch_matches(panda.kin, panda.desired_frames, thetas)
+
+
+def test_forward_kinematics_batch_tree(panda, baxter):
+    rng = np.random.RandomState(3)
+    for robot in (panda, baxter):
+        thetas = rng.uniform(-1, 1, (5, len(robot.kin.active_joint_names)))
+        _assert_batch_matches(robot.kin, robot.root, thetas)
+
+
+def _weighted_error(kin, frames, joints, target_pose):
+    h_mats = kin._compute_h_mats(frames, joints)
+    err = calc_pose_error(target_pose, h_mats[-1], 1e-12)
+    wn_pos, wn_ang = 1 / 0.3, 1 / (2 * np.pi)
+    we = np.array([wn_pos, wn_pos, wn_pos, wn_ang, wn_ang, wn_ang])
+    return float(np.dot(np.square(err).ravel(), we))
+
+
+@pytest.mark.parametrize("method", ["LM", "LM2"])
+def test_inverse_kinematics_batch_matches_scalar(panda, method):
+    rng = np.random.RandomState(4)
+    kin, frames = panda.kin, panda.desired_frames
+    target_thetas = rng.uniform(-1, 1, panda.arm_dof)
+    target_pose = kin._compute_h_mats(frames, target_thetas)[-1]
+
+    # the zero configuration puts panda's wrist at a singularity
+    seeds = np.vstack((np.zeros(panda.arm_dof), rng.uniform(-1, 1, (4, panda.arm_dof))))
+
+    joints = kin.inverse_kinematics(frames, seeds, target_pose, method, max_iter=50)
+
+    scalar_joints = [
+        kin.inverse_kinematics(frames, seed, target_pose, method, max_iter=50)
+        for seed in seeds
+    ]
+    errors = [_weighted_error(kin, frames, q, target_pose) for q in scalar_joints]
+    np.testing.assert_allclose(joints, scalar_joints[np.argmin(errors)], atol=1e-6)
+
+
+def test_solve_damped_fallback():
+    rng = np.random.RandomState(5)
+    A = rng.randn(4, 4)
+    spd = np.dot(A, A.T) + np.eye(4)
+    singular = np.diag([1.0, 2.0, 0.0, 0.0])
+    gerr = rng.randn(4, 1)
+
+    np.testing.assert_allclose(
+        Kinematics._solve_damped(spd, gerr), np.linalg.solve(spd, gerr)
+    )
+    np.testing.assert_allclose(
+        Kinematics._solve_damped(singular, gerr),
+        np.linalg.lstsq(singular, gerr, rcond=None)[0],
+    )
+
+    # one singular system falls back for its own seed only
+    J_dls = np.stack((spd, singular, np.zeros((4, 4))))
+    gerrs = np.stack((gerr, gerr, gerr))
+    dq = Kinematics._solve_damped_batch(J_dls, gerrs)
+    assert dq.shape == (3, 4, 1)
+    for A, b, x in zip(J_dls, gerrs, dq):
+        np.testing.assert_allclose(x, Kinematics._solve_damped(A, b), atol=1e-12)
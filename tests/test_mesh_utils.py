@@ -0,0 +1,29 @@
+import numpy as np
+
+from pykin.utils import mesh_utils as m_utils
+
+
+def test_normalize_list():
+    np.testing.assert_allclose(m_utils.normalize([3, 4]), [0.6, 0.8])
+
+
+def test_get_rotation_from_vectors_list():
+    R = m_utils.get_rotation_from_vectors([1, 0, 0], [0, 1, 0])
+    np.testing.assert_allclose(R.dot([0, 1, 0]), [1, 0, 0], atol=1e-12)
+
+
+def test_get_grasp_directions_list():
+    line = [1, 2, 3]
+    normal_dirs = np.array(list(m_utils.get_grasp_directions(line, 3)))
+    assert normal_dirs.shape == (3, 3)
+    np.testing.assert_allclose(np.linalg.norm(normal_dirs, axis=1), 1.0)
+    np.testing.assert_allclose(normal_dirs.dot(line), 0.0, atol=1e-12)
+
+
+def test_normalize_any_length():
+    np.testing.assert_allclose(m_utils.normalize([3.0, 4.0]), [0.6, 0.8])
+    vec = np.arange(1.0, 7.0).reshape(2, 3)
+    np.testing.assert_allclose(m_utils.normalize(vec), vec / np.linalg.norm(vec))
+    np.testing.assert_allclose(
+        m_utils.normalize(np.array([1.0, 2.0, 2.0])), [1 / 3, 2 / 3, 2 / 3]
+    )
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from pykin.kinematics.transform import Transform
+from pykin.robots.single_arm import SingleArm
+
+
+@pytest.fixture
+def panda_finger():
+    robot = SingleArm(
+        "urdf/panda/panda.urdf", Transform(rot=[0.0, 0.0, 0.0], pos=[0, 0, 0])
+    )
+    # the finger joint makes the chain end in a prismatic joint
+    robot.setup_link_name("panda_link_0", "leftfinger")
+    return robot
+
+
+def test_get_result_qpos_reseed_with_prismatic_joint(panda_finger, monkeypatch):
+    robot = panda_finger
+    limits_lower, limits_upper = robot._get_desired_joint_limits()
+    dof = len(limits_lower)
+    assert dof == robot.arm_dof + 1
+
+    seeds = []
+    inverse_kin = robot.inverse_kin
+
+    def out_of_limits_inverse_kin(current_joints, *args, **kwargs):
+        seeds.append(np.array(current_joints))
+        inverse_kin(current_joints, *args, **kwargs)
+        return limits_upper + 1.0
+
+    monkeypatch.setattr(robot, "inverse_kin", out_of_limits_inverse_kin)
+    np.random.seed(0)
+    init_qpos = np.zeros(dof)
+    target_pose = robot.kin._compute_h_mats(robot.desired_frames, init_qpos)[-1]
+    robot.get_result_qpos(init_qpos, target_pose, max_iter=5)
+
+    # the first solve plus three reseeds
+    assert len(seeds) == 4
+    for seed in seeds[1:]:
+        assert seed.shape == (dof,)
+        assert np.all(seed >= limits_lower) and np.all(seed <= limits_upper)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from pykin.utils import transform_utils as t_utils
+
+
+def _random_quaternions(n, seed):
+    q = np.random.RandomState(seed).randn(n, 4)
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def test_quaternion_slerp_closed_form():
+    half = np.sqrt(0.5)
+    qA = np.array([1.0, 0.0, 0.0, 0.0])
+    # 90 degrees about z, interpolated halfway is 45 degrees about z
+    qB = np.array([half, 0.0, 0.0, half])
+    expected = np.array([np.cos(np.pi / 8), 0.0, 0.0, np.sin(np.pi / 8)])
+    np.testing.assert_allclose(t_utils.get_quaternion_slerp(qA, qB, 0.5), expected)
+    np.testing.assert_allclose(
+        t_utils.get_quaternion_slerp_batch(qA, qB, [0.0, 0.5, 1.0]),
+        [qA, expected, qB],
+        atol=1e-12,
+    )
+
+
+def test_quaternion_slerp_matches_scipy():
+    Rotation = pytest.importorskip("scipy.spatial.transform").Rotation
+    Slerp = pytest.importorskip("scipy.spatial.transform").Slerp
+
+    steps = np.linspace(0, 1, 7)
+    qAs, qBs = _random_quaternions(20, 0), _random_quaternions(20, 1)
+    for qA, qB in zip(qAs, qBs):
+        key_rots = Rotation.from_quat(np.roll([qA, qB], -1, axis=1))
+        expected = np.roll(Slerp([0, 1], key_rots)(steps).as_quat(), 1, axis=1)
+
+        batch = t_utils.get_quaternion_slerp_batch(qA, qB, steps)
+        scalar = np.array([t_utils.get_quaternion_slerp(qA, qB, t) for t in steps])
+        for result in (batch, scalar):
+            # q and -q are the same rotation
+            signs = np.sign(np.sum(result * expected, axis=1, keepdims=True))
+            np.testing.assert_allclose(result * signs, expected, atol=1e-9)
+
+
+def _baseline_quaternion_from_matrix(R):
+    # the formula get_quaternion_from_matrix used before Shepperd's method
+    w = 0.5 * np.sqrt(R[0, 0] + R[1, 1] + R[2, 2] + 1)
+    x = 0.5 * np.sign(R[2, 1] - R[1, 2]) * np.sqrt(R[0, 0] - R[1, 1] - R[2, 2] + 1)
+    y = 0.5 * np.sign(R[0, 2] - R[2, 0]) * np.sqrt(R[1, 1] - R[2, 2] - R[0, 0] + 1)
+    z = 0.5 * np.sign(R[1, 0] - R[0, 1]) * np.sqrt(R[2, 2] - R[0, 0] - R[1, 1] + 1)
+    return np.array([w, x, y, z])
+
+
+@pytest.mark.parametrize(
+    "axis, angle",
+    [
+        # trace > 0
+        ([0.3, -0.5, 0.8], 0.7),
+        # trace <= 0 with r00, r11 or r22 the largest diagonal term
+        ([1.0, 0.1, -0.2], 3.0),
+        ([0.1, -1.0, 0.2], 2.9),
+        ([-0.2, 0.1, 1.0], 3.1),
+        ([1.0, 0.0, 0.0], np.pi),
+    ],
+)
+def test_quaternion_from_matrix_round_trip(axis, angle):
+    axis = np.asarray(axis) / np.linalg.norm(axis)
+    q = np.hstack((np.cos(angle / 2), np.sin(angle / 2) * axis))
+    for sign in (1.0, -1.0):
+        R = t_utils.get_matrix_from_quaternion(sign * q)
+        result = t_utils.get_quaternion_from_matrix(R)
+        # q and -q are the same rotation, the scalar part is kept non-negative
+        assert result[0] >= 0.0
+        np.testing.assert_allclose(result, q, atol=1e-12)
+        np.testing.assert_allclose(
+            t_utils.get_matrix_from_quaternion(result), R, atol=1e-12
+        )
+
+    xyzw = t_utils.get_quaternion_from_matrix(R, convention="xyzw")
+    np.testing.assert_allclose(xyzw, np.roll(q, -1), atol=1e-12)
+
+
+def test_quaternion_from_matrix_matches_baseline_sign():
+    for q in _random_quaternions(200, 2):
+        R = t_utils.get_matrix_from_quaternion(q)
+        expected = _baseline_quaternion_from_matrix(R)
+        # the old formula loses precision near 180 degrees and at zero components
+        if expected[0] < 0.1 or np.min(np.abs(expected[1:])) < 0.1:
+            continue
+        np.testing.assert_allclose(
+            t_utils.get_quaternion_from_matrix(R), expected, atol=1e-9
+        )